@@ -1,18 +1,67 @@
+from array import array
 import ast
 import base64
+import cProfile
+from contextlib import contextmanager
+from contextvars import ContextVar
+import csv
 from datetime import datetime, timedelta
+import gzip
 from html import unescape
+import io
 import json
+import mmap
 import os
+import pstats
 import re
+import struct
+import sys
+import tempfile
+import threading
+import time
 import traceback
+import zipfile
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 
 import requests
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 CACHE_FILE = '/tmp/cache.txt'
+CACHE_LOCK_FILE = f'{CACHE_FILE}.lock'
+CHANGES_FILE = '/tmp/changes.txt'
 CACHE_EXPIRY = timedelta(days=1)
+CACHE_SNAPSHOT_PATH = os.environ.get('CACHE_SNAPSHOT_PATH')
+CACHE_SNAPSHOT_URL = os.environ.get('CACHE_SNAPSHOT_URL')
+CACHE_SNAPSHOT_TIMEOUT = float(os.environ.get('CACHE_SNAPSHOT_TIMEOUT', 5))
+
+FUNDAMENTUS_LISTING_EXPIRY = timedelta(hours=1)
+
+NEGATIVE_CACHE_EXPIRY = timedelta(hours=6)
+NEGATIVE_CACHE_MAX_SIZE = int(os.environ.get('NEGATIVE_CACHE_MAX_SIZE', 10000))
+TICKER_PATTERN = re.compile(r'[A-Z0-9]{4}\d{1,2}[A-Z]?')
+
+HISTORY_ENABLED = os.environ.get('HISTORY_ENABLED', '0') == '1'
+HISTORY_FILE = '/tmp/history.bin'
+HISTORY_KEYFRAME_INTERVAL = timedelta(days=30)
+HISTORY_RECORD = struct.Struct('<d16sBd')
+
+CVM_CACHE_EXPIRY = timedelta(days=31)
+CVM_INFORME_MENSAL_SOURCE = os.environ.get('CVM_INFORME_MENSAL_SOURCE', 'https://dados.cvm.gov.br/dados/FII/DOC/INF_MENSAL/DADOS/inf_mensal_fii_{year}.zip')
 
 DATE_FORMAT = '%d-%m-%Y %H:%M:%S'
 
@@ -22,6 +71,43 @@ INFO_LOG_LEVEL = 'INFO'
 LOG_LEVEL = os.environ.get('LOG_LEVEL', ERROR_LOG_LEVEL)
 
 SEPARATOR = '#@#'
+FIELD_SEPARATOR = '\x1f'
+
+CACHE_SOURCE = 'cache'
+FINAL_SOURCE = 'final'
+FUNDAMENTUS_LISTING_SOURCE = 'fundamentus_listing'
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+ACCEPT_ENCODING = 'gzip, deflate, br' if brotli else 'gzip, deflate'
+COMPRESSION_LEVEL = int(os.environ.get('COMPRESSION_LEVEL', 6))
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))
+
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '0') == '1'
+PROFILE_DIRECTORY = os.environ.get('PROFILE_DIRECTORY', '/tmp')
+PROFILE_MAX_FUNCTIONS = int(os.environ.get('PROFILE_MAX_FUNCTIONS', 50))
+
+HTML_TAG_PATTERN = re.compile(r'<[^>]*>')
+LINE_BREAKS_TABLE = str.maketrans('', '', '\n\t')
+
+NUMBER_MAGNITUDES = {
+    'B': 1_000_000_000,
+    'Bi': 1_000_000_000,
+    'Bilhão': 1_000_000_000,
+    'Bilhões': 1_000_000_000,
+    'K': 1_000,
+    'M': 1_000_000,
+    'Mi': 1_000_000,
+    'Mil': 1_000,
+    'Milhão': 1_000_000,
+    'Milhões': 1_000_000
+}
+NUMBER_PATTERN = re.compile(
+    r'(?:R\$\s*)?(?P<sign>[-+]?)\s*(?:R\$\s*)?(?P<number>\d[\d.]*(?:,\d*)?|,\d+)\s*(?P<suffix>%|' +
+    '|'.join(sorted(NUMBER_MAGNITUDES, key=len, reverse=True)) +
+    r')?'
+)
+NUMBER_SEPARATORS_TABLE = str.maketrans({ '.': None, ',': '.' })
 
 VALID_SOURCES = {
     'ALL_SOURCE': 'all',
@@ -72,9 +158,104 @@ VALID_INFOS = [
     'variation_30d'
 ]
 
+# Positions are stored in the history file, so new fields must only be appended
+HISTORY_INFOS = (
+    'assets_value',
+    'avg_price',
+    'cash_value',
+    'debit_by_real_state_acquisition',
+    'debit_by_securitization_receivables_acquisition',
+    'dy',
+    'equity_price',
+    'ffoy',
+    'latest_dividend',
+    'latests_dividends',
+    'liquidity',
+    'market_value',
+    'max_52_weeks',
+    'mayer_multiple',
+    'min_52_weeks',
+    'net_equity_value',
+    'price',
+    'pvp',
+    'total_issued_shares',
+    'total_mortgage',
+    'total_mortgage_value',
+    'total_real_state',
+    'total_real_state_value',
+    'total_stocks_fund_others',
+    'total_stocks_fund_others_value',
+    'vacancy',
+    'variation_12m',
+    'variation_30d'
+)
+HISTORY_INFO_INDEXES = { info: index for index, info in enumerate(HISTORY_INFOS) }
+
+INTERNED_INFOS = frozenset([ 'actuation', 'management', 'segment', 'target_public', 'term', 'type' ])
+FUND_RECORD_INFOS = frozenset(VALID_INFOS)
+
+class FundRecord:
+    __slots__ = tuple(VALID_INFOS)
+
+    def __init__(self, data=None):
+        if data:
+            self.update(data)
+
+    def __getitem__(self, info):
+        if info not in FUND_RECORD_INFOS:
+            raise KeyError(info)
+
+        try:
+            return getattr(self, info)
+        except AttributeError:
+            raise KeyError(info)
+
+    def __setitem__(self, info, value):
+        if info not in FUND_RECORD_INFOS:
+            raise KeyError(info)
+
+        setattr(self, info, sys.intern(value) if info in INTERNED_INFOS and isinstance(value, str) else value)
+
+    def __contains__(self, info):
+        return info in FUND_RECORD_INFOS and hasattr(self, info)
+
+    def __iter__(self):
+        return (info for info in VALID_INFOS if hasattr(self, info))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __eq__(self, other):
+        return dict(self.items()) == (dict(other.items()) if isinstance(other, FundRecord) else other)
+
+    def __repr__(self):
+        return f'FundRecord({dict(self.items())})'
+
+    def get(self, info, default=None):
+        return self[info] if info in self else default
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [ getattr(self, info) for info in self ]
+
+    def items(self):
+        return [ (info, getattr(self, info)) for info in self ]
+
+    def update(self, data):
+        for info, value in data.items():
+            self[info] = value
+
 investidor_10_preloaded_data = (None, None)
 fundamentus_preloaded_data = (None, None)
 fiis_preloaded_data = (None, None)
+fundamentus_listing_data = (None, None)
+negative_cache = {}
+known_tickers = set()
+profile_timings = ContextVar('profile_timings', default=None)
+profile_lock = threading.Lock()
+history_index = (0, {}, {})
 
 app = Flask(__name__)
 app.json.sort_keys = False
@@ -98,51 +279,373 @@ def cache_exists():
     log_info('No cache file found')
     return False
 
-def upsert_cache(id, data):
+@contextmanager
+def cache_lock():
+    with open(CACHE_LOCK_FILE, 'a') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def encode_json(data):
+    return orjson.dumps(data).decode('utf-8') if orjson else json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+def decode_json(text):
+    return orjson.loads(text) if orjson else json.loads(text)
+
+def encode_json_fragments(data):
+    return { info: f'{encode_json(info)}:{encode_json(value)}' for info, value in data.items() }
+
+def decode_json_fragments(fragments):
+    return decode_json(join_json_fragments(fragments, fragments.keys()))
+
+def join_json_fragments(fragments, info_names):
+    return '{' + ','.join(fragments[info] for info in info_names) + '}'
+
+def is_null_json_fragment(fragment):
+    return fragment.endswith(':null')
+
+def parse_cache_fragments(data_as_text):
+    if not data_as_text:
+        return {}
+
+    if data_as_text.startswith('{'):
+        return encode_json_fragments(ast.literal_eval(data_as_text))
+
+    return { fragment[1:fragment.index('"', 1)]: fragment for fragment in data_as_text.split(FIELD_SEPARATOR) }
+
+def format_cache_line(id, cached_date_as_text, fragments):
+    return f'{id}{SEPARATOR}{cached_date_as_text}{SEPARATOR}{FIELD_SEPARATOR.join(fragments.values())}\n'
+
+def read_cache_lines():
+    if not cache_exists():
+        return []
+
+    with open(CACHE_FILE, 'r', encoding='utf-8') as cache_file:
+        return cache_file.readlines()
+
+def write_cache_lines(lines):
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(CACHE_FILE), prefix='.cache-')
+
+    try:
+        with os.fdopen(file_descriptor, 'w', encoding='utf-8') as temporary_file:
+            temporary_file.writelines(lines)
+
+        os.replace(temporary_path, CACHE_FILE)
+    except:
+        os.remove(temporary_path)
+        raise
+
+def parse_change_version(line):
+    version_as_text = line.split(SEPARATOR.encode(), 1)[0]
+    return int(version_as_text) if line.endswith(b'\n') and version_as_text.isdigit() else None
+
+def read_latest_change_version():
+    if not os.path.exists(CHANGES_FILE):
+        return 0
+
+    with open(CHANGES_FILE, 'rb') as changes_file:
+        changes_file.seek(0, os.SEEK_END)
+        position = changes_file.tell()
+        tail = b''
+
+        while position > 0:
+            read_size = min(4096, position)
+            position -= read_size
+            changes_file.seek(position)
+            lines = (changes_file.read(read_size) + tail).splitlines(keepends=True)
+
+            tail = lines.pop(0) if position > 0 else b''
+
+            for line in reversed(lines):
+                version = parse_change_version(line)
+                if version is not None:
+                    return version
+
+    return 0
+
+def seek_change_line(changes_file, position):
+    changes_file.seek(max(position - 1, 0))
+
+    if position > 0:
+        changes_file.readline()
+
+    return changes_file.tell()
+
+def read_change_version_after(changes_file, position):
+    seek_change_line(changes_file, position)
+
+    for line in changes_file:
+        version = parse_change_version(line)
+        if version is not None:
+            return version
+
+    return None
+
+def find_changes_offset(changes_file, since_version):
+    changes_file.seek(0, os.SEEK_END)
+    low, high = 0, changes_file.tell()
+
+    while low < high:
+        middle = (low + high) // 2
+        version = read_change_version_after(changes_file, middle)
+
+        if version is not None and version <= since_version:
+            low = middle + 1
+        else:
+            high = middle
+
+    return seek_change_line(changes_file, low)
+
+def append_changes(changes):
+    if not changes:
+        return
+
+    version = read_latest_change_version()
     lines = []
-    updated = False
 
-    if cache_exists():
-        with open(CACHE_FILE, 'r') as cache_file:
-            lines = cache_file.readlines()
+    for id, changed_data in changes:
+        version += 1
+        lines.append(f'{version}{SEPARATOR}{id}{SEPARATOR}{encode_json(changed_data)}\n')
+
+    with open(CHANGES_FILE, 'ab+') as changes_file:
+        changes_file.seek(0, os.SEEK_END)
+
+        if changes_file.tell() > 0:
+            changes_file.seek(-1, os.SEEK_END)
+            if changes_file.read(1) != b'\n':
+                lines.insert(0, '\n')
+
+        changes_file.write(''.join(lines).encode('utf-8'))
 
-    with open(CACHE_FILE, 'w') as cache_file:
-        for line in lines:
-            if not line.startswith(id):
-                cache_file.write(line)
+    log_debug(f'Change log advanced to version {version}')
+
+def read_changes(since_version):
+    changes = {}
+    latest_version = since_version
+
+    if not os.path.exists(CHANGES_FILE):
+        return latest_version, changes
+
+    with open(CHANGES_FILE, 'rb') as changes_file:
+        changes_file.seek(find_changes_offset(changes_file, since_version))
+
+        for line in changes_file:
+            version = parse_change_version(line)
+
+            if version is None:
+                log_error(f'Skipping malformed change log line: {line!r}')
+                continue
+
+            if version <= since_version:
                 continue
 
-            _, old_cached_date_as_text, old_data_as_text = line.strip().split(SEPARATOR)
-            old_data = ast.literal_eval(old_data_as_text)
+            try:
+                _, id, changed_data_as_text = line.decode('utf-8').rstrip('\n').split(SEPARATOR, 2)
+                changed_data = decode_json(changed_data_as_text)
+            except ValueError:
+                log_error(f'Skipping malformed change log entry {version}')
+                continue
 
-            combined_data = { **old_data, **data }
-            updated_line = f'{id}{SEPARATOR}{old_cached_date_as_text}{SEPARATOR}{combined_data}\n'
-            cache_file.write(updated_line)
-            updated = True
+            changes.setdefault(id, {}).update(changed_data)
+            latest_version = version
 
-        if not updated:
-            new_line = f'{id}{SEPARATOR}{datetime.now().strftime(DATE_FORMAT)}{SEPARATOR}{data}\n'
-            cache_file.write(new_line)
-            log_info(f'New cache entry created for "{id}"')
+    return latest_version, changes
 
-    if updated:
+def get_changed_data(old_fragments, new_fragments, new_data):
+    return { info: new_data[info] for info, fragment in new_fragments.items() if old_fragments.get(info) != fragment }
+
+def upsert_cache_entries(entries, should_refresh_date=False, should_record_changes=True):
+    updated_ids = set()
+    changes = []
+    now_as_text = datetime.now().strftime(DATE_FORMAT)
+
+    with cache_lock():
+        new_lines = []
+
+        for line in read_cache_lines():
+            id = line.split(SEPARATOR, 1)[0]
+
+            if id not in entries:
+                new_lines.append(line)
+                continue
+
+            _, old_cached_date_as_text, old_data_as_text = line.rstrip('\n').split(SEPARATOR, 2)
+            old_fragments = parse_cache_fragments(old_data_as_text)
+            new_fragments = encode_json_fragments(entries[id])
+
+            changed_data = get_changed_data(old_fragments, new_fragments, entries[id])
+            if changed_data:
+                changes.append((id, changed_data))
+
+            cached_date_as_text = now_as_text if should_refresh_date else old_cached_date_as_text
+            new_lines.append(format_cache_line(id, cached_date_as_text, { **old_fragments, **new_fragments }))
+            updated_ids.add(id)
+
+        created_ids = [ id for id in entries if id not in updated_ids ]
+
+        for id in created_ids:
+            new_lines.append(format_cache_line(id, now_as_text, encode_json_fragments(entries[id])))
+            changes.append((id, dict(entries[id].items())))
+
+        write_cache_lines(new_lines)
+
+        if should_record_changes:
+            append_changes(changes)
+
+        if should_record_changes and HISTORY_ENABLED:
+            append_history(entries)
+
+    for id in updated_ids:
         log_info(f'Cache updated for "{id}"')
 
+    for id in created_ids:
+        log_info(f'New cache entry created for "{id}"')
+
+def upsert_cache(id, data):
+    upsert_cache_entries({ id: data })
+
+def read_history_index():
+    global history_index
+
+    offset, last_records, record_numbers = history_index
+    if not os.path.exists(HISTORY_FILE):
+        history_index = (0, {}, {})
+        return history_index
+
+    with open(HISTORY_FILE, 'rb') as history_file:
+        history_file.seek(0, os.SEEK_END)
+        size = history_file.tell() // HISTORY_RECORD.size * HISTORY_RECORD.size
+
+        if size < offset:
+            offset, last_records, record_numbers = 0, {}, {}
+
+        history_file.seek(offset)
+        tail = history_file.read(size - offset)
+
+    for record_number, (timestamp, id, info_index, value) in enumerate(HISTORY_RECORD.iter_unpack(tail), offset // HISTORY_RECORD.size):
+        last_records[(id, info_index)] = (timestamp, value)
+        record_numbers.setdefault(id, array('I')).append(record_number)
+
+    history_index = (size, last_records, record_numbers)
+
+    return history_index
+
+def append_history(entries):
+    size, last_records, _ = read_history_index()
+    timestamp = time.time()
+    keyframe_interval = HISTORY_KEYFRAME_INTERVAL.total_seconds()
+    records = []
+
+    for id, data in entries.items():
+        encoded_id = id.encode('utf-8')
+        if len(encoded_id) > 16:
+            continue
+
+        encoded_id = encoded_id.ljust(16, b'\0')
+
+        for info, value in data.items():
+            info_index = HISTORY_INFO_INDEXES.get(info)
+            if info_index is None or isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+
+            last_record = last_records.get((encoded_id, info_index))
+            if last_record and last_record[1] == value and timestamp - last_record[0] < keyframe_interval:
+                continue
+
+            records.append(HISTORY_RECORD.pack(timestamp, encoded_id, info_index, value))
+            last_records[(encoded_id, info_index)] = (timestamp, value)
+
+    if not records:
+        return
+
+    if os.path.exists(HISTORY_FILE) and os.path.getsize(HISTORY_FILE) != size:
+        log_error(f'Truncating torn history records after byte {size}')
+        os.truncate(HISTORY_FILE, size)
+
+    with open(HISTORY_FILE, 'ab') as history_file:
+        history_file.write(b''.join(records))
+
+    log_debug(f'History advanced with {len(records)} records')
+
+def find_history_position(history, record_numbers, timestamp):
+    low, high = 0, len(record_numbers)
+
+    while low < high:
+        middle = (low + high) // 2
+        if HISTORY_RECORD.unpack_from(history, record_numbers[middle] * HISTORY_RECORD.size)[0] < timestamp:
+            low = middle + 1
+        else:
+            high = middle
+
+    return low
+
+def read_history(id, info_names, from_date, to_date):
+    history = { info: [] for info in info_names if info in HISTORY_INFO_INDEXES }
+    encoded_id = id.encode('utf-8').ljust(16, b'\0')
+
+    with cache_lock():
+        _, _, record_numbers = read_history_index()
+        id_record_numbers = record_numbers.get(encoded_id)
+
+    if not history or not id_record_numbers:
+        return history
+
+    infos_by_index = { HISTORY_INFO_INDEXES[info]: info for info in history }
+    from_timestamp = from_date.timestamp()
+    to_timestamp = to_date.timestamp()
+    records = []
+
+    with open(HISTORY_FILE, 'rb') as history_file, mmap.mmap(history_file.fileno(), 0, access=mmap.ACCESS_READ) as history_map:
+        start = find_history_position(history_map, id_record_numbers, (from_date - HISTORY_KEYFRAME_INTERVAL).timestamp())
+
+        for record_number in id_record_numbers[start:]:
+            timestamp, _, info_index, value = HISTORY_RECORD.unpack_from(history_map, record_number * HISTORY_RECORD.size)
+
+            if timestamp >= to_timestamp:
+                break
+
+            if info_index in infos_by_index:
+                records.append((timestamp, infos_by_index[info_index], value))
+
+    initial_values = {}
+
+    for timestamp, info, value in records:
+        if timestamp < from_timestamp:
+            initial_values[info] = (timestamp, value)
+            continue
+
+        if info in initial_values:
+            history[info].append(initial_values.pop(info))
+
+        if not history[info] or history[info][-1][1] != value:
+            history[info].append((timestamp, value))
+
+    for info, initial_value in initial_values.items():
+        history[info].append(initial_value)
+
+    return { info: [ [ datetime.fromtimestamp(timestamp).strftime(DATE_FORMAT), value ] for timestamp, value in values ] for info, values in history.items() }
+
 def clear_cache(id):
     if not cache_exists():
         return
 
     log_debug('Cleaning cache')
 
-    with open(CACHE_FILE, 'r') as cache_file:
-        lines = cache_file.readlines()
-
-    with open(CACHE_FILE, 'w') as cache_file:
-        cache_file.writelines(line for line in lines if not line.startswith(id))
+    with cache_lock():
+        write_cache_lines([ line for line in read_cache_lines() if line.split(SEPARATOR, 1)[0] != id ])
 
     log_info(f'Cache cleaning completed for "{id}"')
 
-def read_cache(id):
+def read_cache(id, expiry=CACHE_EXPIRY):
+    cached_fragments = read_cache_fragments(id, expiry)
+    return decode_json_fragments(cached_fragments) if cached_fragments is not None else None
+
+def read_cache_fragments(id, expiry=CACHE_EXPIRY):
     if not cache_exists():
         return None
 
@@ -150,17 +653,17 @@ def read_cache(id):
 
     clear_cache_control = False
 
-    with open(CACHE_FILE, 'r') as cache_file:
+    with open(CACHE_FILE, 'r', encoding='utf-8') as cache_file:
         for line in cache_file:
-            if not line.startswith(id):
+            if line.split(SEPARATOR, 1)[0] != id:
                 continue
 
-            _, cached_date_as_text, data = line.strip().split(SEPARATOR)
+            _, cached_date_as_text, data = line.rstrip('\n').split(SEPARATOR, 2)
             cached_date = datetime.strptime(cached_date_as_text, DATE_FORMAT)
 
-            if datetime.now() - cached_date <= CACHE_EXPIRY:
+            if datetime.now() - cached_date <= expiry:
                 log_debug(f'Cache hit for "{id}" (Date: {cached_date_as_text})')
-                return ast.literal_eval(data)
+                return parse_cache_fragments(data)
 
             log_debug(f'Cache expired for "{id}" (Date: {cached_date_as_text})')
             clear_cache_control = True
@@ -178,171 +681,321 @@ def delete_cache():
 
     log_debug('Deleting cache')
 
-    os.remove(CACHE_FILE)
+    negative_cache.clear()
+
+    with cache_lock():
+        if cache_exists():
+            os.remove(CACHE_FILE)
 
     log_info('Cache deletion completed')
 
+def export_cache_snapshot():
+    with cache_lock():
+        lines = read_cache_lines()
+
+    snapshot = gzip.compress(''.join(lines).encode('utf-8'), compresslevel=9)
+
+    log_info(f'Cache snapshot exported with {len(lines)} entries in {len(snapshot)} bytes')
+
+    return snapshot
+
+def import_cache_snapshot(snapshot):
+    lines = [ f'{line}\n' for line in gzip.decompress(snapshot).decode('utf-8').split('\n') if line ]
+
+    with cache_lock():
+        if cache_exists():
+            log_info('Cache already warm, snapshot ignored')
+            return 0
+
+        write_cache_lines(lines)
+
+    return len(lines)
+
+def load_cache_snapshot():
+    if not (CACHE_SNAPSHOT_PATH or CACHE_SNAPSHOT_URL) or os.path.exists(CACHE_FILE):
+        return
+
+    start_time = time.perf_counter()
+
+    try:
+        if CACHE_SNAPSHOT_PATH and os.path.exists(CACHE_SNAPSHOT_PATH):
+            with open(CACHE_SNAPSHOT_PATH, 'rb') as snapshot_file:
+                snapshot = snapshot_file.read()
+        elif CACHE_SNAPSHOT_URL:
+            snapshot = request_get(CACHE_SNAPSHOT_URL, timeout=CACHE_SNAPSHOT_TIMEOUT).content
+        else:
+            log_info(f'No cache snapshot found at "{CACHE_SNAPSHOT_PATH}"')
+            return
+
+        total_entries = import_cache_snapshot(snapshot)
+
+        log_info(f'Cache snapshot with {total_entries} entries loaded in {(time.perf_counter() - start_time) * 1000:.2f} ms')
+    except:
+        log_error(f'Error loading cache snapshot: {traceback.format_exc()}')
+
 def preprocess_cache(id, should_delete_all_cache, should_clear_cached_data, should_use_cache):
     if should_delete_all_cache:
         delete_cache()
     elif should_clear_cached_data:
         clear_cache(id)
+        negative_cache.pop(id, None)
 
     can_use_cache = should_use_cache and not (should_delete_all_cache or should_clear_cached_data)
 
     return can_use_cache
 
-def get_substring(text, start_text, end_text, replace_by_paterns=[], should_remove_tags=False):
+def compile_cleanup(patterns_to_remove):
+    if isinstance(patterns_to_remove, str):
+        characters_table = str.maketrans('', '', patterns_to_remove)
+        return lambda text: text.translate(characters_table)
+
+    patterns = re.compile('|'.join(re.escape(pattern) for pattern in sorted(patterns_to_remove, key=len, reverse=True)))
+    return lambda text: patterns.sub('', text)
+
+def get_substring(text, start_text, end_text, cleanup=None, should_remove_tags=False):
     start_index = text.find(start_text)
-    new_text = text[start_index:]
+    if start_index == -1:
+        return None
+
+    content_start_index = start_index + len(start_text)
+
+    end_index = text.find(end_text, content_start_index)
+    if end_index == -1:
+        return None
 
-    end_index = new_text[len(start_text):].find(end_text) + len(start_text)
-    cutted_text = new_text[len(start_text):end_index]
+    cutted_text = text[content_start_index:end_index]
 
     if not cutted_text:
         return None
 
-    clean_text = cutted_text.replace('\n', '').replace('\t', '')
+    clean_text = cutted_text.translate(LINE_BREAKS_TABLE)
 
-    no_tags_text = re.sub(r'<[^>]*>', '', clean_text) if should_remove_tags else clean_text
+    no_tags_text = HTML_TAG_PATTERN.sub('', clean_text) if should_remove_tags else clean_text
 
-    final_text = no_tags_text
-    for pattern in replace_by_paterns:
-        final_text = final_text.replace(pattern, '')
+    final_text = cleanup(no_tags_text) if cleanup else no_tags_text
 
     return final_text.strip()
 
-def text_to_number(text, should_convert_thousand_decimal_separators=True, convert_percent_to_decimal=False):
-    try:
-        if not text:
-            raise Exception()
+def parse_number(text, convert_percent_to_decimal=False):
+    if isinstance(text, (int, float)):
+        return text
+
+    if not text:
+        return None
 
-        if not isinstance(text, str):
-            return text
+    match = NUMBER_PATTERN.fullmatch(text.strip())
+    if not match:
+        return None
 
-        text = text.strip()
+    sign, number, suffix = match.group('sign', 'number', 'suffix')
 
-        if not text.strip():
-            raise Exception()
+    value = float(number.translate(NUMBER_SEPARATORS_TABLE))
 
-        if should_convert_thousand_decimal_separators:
-            text = text.replace('.','').replace(',','.')
+    if sign == '-':
+        value = -value
 
-        if '%' in text:
-            return float(text.replace('%', '').strip()) / (100 if convert_percent_to_decimal else 1)
+    if suffix == '%':
+        return value / 100 if convert_percent_to_decimal else value
 
-        if 'R$' in text:
-            text = text.replace('R$', '')
+    return value * NUMBER_MAGNITUDES[suffix] if suffix else value
 
-        return float(text.strip())
-    except:
-        return 0
+def parse_numbers(texts, convert_percent_to_decimal=False):
+    return [ parse_number(text, convert_percent_to_decimal) for text in texts ]
+
+class TickerNotFoundError(Exception):
+    pass
 
-def request_get(url, headers=None):
-    response = requests.get(url, headers=headers)
+source_failures = ContextVar('source_failures', default=None)
+
+def is_not_found_error(error):
+    return isinstance(error, TickerNotFoundError) or (isinstance(error, requests.HTTPError) and error.response is not None and error.response.status_code == 404)
+
+def record_source_failure():
+    failures = source_failures.get()
+    if failures is not None:
+        failures.append(is_not_found_error(sys.exc_info()[1]))
+
+def request_get(url, headers=None, timeout=None):
+    response = requests.get(url, headers={ **(headers or {}), 'Accept-Encoding': ACCEPT_ENCODING }, timeout=timeout)
     response.raise_for_status()
 
     log_debug(f'Response from {url} : {response}')
 
+    content_encoding = response.headers.get('Content-Encoding')
+    if content_encoding and 'Content-Length' in response.headers:
+        encoded_size = int(response.headers['Content-Length'])
+        decoded_size = len(response.content)
+        log_debug(f'Transfer from {url} encoded with {content_encoding}: {encoded_size} bytes on the wire, {decoded_size} bytes decoded ({decoded_size - encoded_size} bytes saved)')
+
     return response
 
-def convert_bmfbovespa_data(IME_doc, ITE_doc, RA_docs, cnpj, info_names):
-    patterns_to_remove = [
-        '</b>',
-        '</span>',
-        '</td>',
-        '<b>',
-        '<center>',
-        '<span class="dado-cabecalho">',
-        '<span class="dado-valores">',
-        '<span>',
-        '<td align="center">',
-        '<td>'
-    ]
-
-    def count_total_real_state_value():
-        return text_to_number(get_substring(IME_doc[0], 'Direitos reais sobre bens im&oacute;veis ', '</span>', patterns_to_remove))
-
-    def count_total_mortgage_value():
-        return (
-            text_to_number(get_substring(IME_doc[0], 'Certificados de Dep&oacute;sitos de Valores Mobili&aacute;rios', '</span>', patterns_to_remove)) +
-            text_to_number(get_substring(IME_doc[0], 'Notas Promiss&oacute;rias', '</span>', patterns_to_remove)) +
-            text_to_number(get_substring(IME_doc[0], 'Notas Comerciais', '</span>', patterns_to_remove)) +
-            text_to_number(get_substring(IME_doc[0], 'CRI" (se FIAGRO, Certificado de Receb&iacute;veis do Agroneg&oacute;cio "CRA")', '</span>', patterns_to_remove)) +
-            text_to_number(get_substring(IME_doc[0], 'Hipotec&aacute;rias', '</span>', patterns_to_remove)) +
-            text_to_number(get_substring(IME_doc[0], 'LCI" (se FIAGRO, Letras de Cr&eacute;dito do Agroneg&oacute;cio "LCA")', '</span>', patterns_to_remove)) +
-            text_to_number(get_substring(IME_doc[0], 'LIG)', '</span>', patterns_to_remove))
-        )
+def unescape_text(text):
+    return unescape(text) if text else text
 
-    def count_total_stocks_fund_others_value():
-        return (
-                text_to_number(get_substring(IME_doc[0], 'A&ccedil;&otilde;es', '</span>', patterns_to_remove)) +
-                text_to_number(get_substring(IME_doc[0], 'Deb&ecirc;ntures', '</span>', patterns_to_remove)) +
-                text_to_number(get_substring(IME_doc[0], 'certificados de desdobramentos', '</span>', patterns_to_remove)) +
-                text_to_number(get_substring(IME_doc[0], 'FIA)', '</span>', patterns_to_remove)) +
-                text_to_number(get_substring(IME_doc[0], 'FIP)', '</span>', patterns_to_remove)) +
-                text_to_number(get_substring(IME_doc[0], 'FII)', '</span>', patterns_to_remove)) +
-                text_to_number(get_substring(IME_doc[0], 'FIDC)', '</span>', patterns_to_remove)) +
-                text_to_number(get_substring(IME_doc[0], 'Outras cotas de Fundos de Investimento', '</span>', patterns_to_remove)) +
-                text_to_number(get_substring(IME_doc[0], 'A&ccedil;&otilde;es de Sociedades cujo &uacute;nico prop&oacute;sito se enquadra entre as atividades permitidas aos FII', '</span>', patterns_to_remove)) +
-                text_to_number(get_substring(IME_doc[0], 'Cotas de Sociedades que se enquadre entre as atividades permitidas aos FII', '</span>', patterns_to_remove)) +
-                text_to_number(get_substring(IME_doc[0], 'CEPAC)', '</span>', patterns_to_remove)) +
-                text_to_number(get_substring(IME_doc[0], 'Outros Valores Mobili&aacute;rios', '</span>', patterns_to_remove))
-            )
-
-    def fii_type():
-        fii_type = {
-            'Outro': count_total_stocks_fund_others_value(),
-            'Papel': count_total_mortgage_value(),
-            'Tijolo': count_total_real_state_value()
-        }
+def first_document(documents):
+    return documents[0] if documents else None
 
-        return max(fii_type, key=fii_type.get)
-
-    ALL_INFO = {
-        'actuation': lambda: None,
-        'assets_value': lambda: text_to_number(get_substring(IME_doc[0], 'Ativo &ndash; R$', '</span>', patterns_to_remove)),
-        'avg_price': lambda: None,
-        'cash_value': lambda: text_to_number(get_substring(IME_doc[0], 'Total mantido para as Necessidades de Liquidez (art. 46, &sect; &uacute;nico, ICVM 472/08) </b>', '</span>', patterns_to_remove)),
-        'debit_by_real_state_acquisition': lambda: text_to_number(get_substring(IME_doc[0], 'Obriga&ccedil;&otilde;es por aquisi&ccedil;&atilde;o de im&oacute;veis', '</span>', patterns_to_remove)),
-        'debit_by_securitization_receivables_acquisition': lambda: text_to_number(get_substring(IME_doc[0], 'Obriga&ccedil;&otilde;es por securitiza&ccedil;&atilde;o de receb&iacute;veis', '</span>', patterns_to_remove)),
-        'dy': lambda: None,
-        'equity_price': lambda: text_to_number(get_substring(IME_doc[0], 'Valor Patrimonial das Cotas &ndash; R$', '</span>', patterns_to_remove)),
-        'ffoy': lambda: None,
-        'initial_date': lambda: get_substring(IME_doc[0], 'doc de Funcionamento:', '</span>', patterns_to_remove),
-        'latest_dividend': lambda: RA_docs[max(RA_docs.keys(), key=lambda date: datetime.strptime(date, "%d%m%Y"))] if len(RA_docs) else None,
-        'latests_dividends': lambda: sum(RA_docs.values()),
-        'link': lambda: f'https://fnet.bmfbovespa.com.br/fnet/publico/abrirGerenciadorDocumentosCVM?cnpjFundo={cnpj}#',
-        'liquidity': lambda: None,
-        'management': lambda: get_substring(IME_doc[0], 'Tipo de Gest&atilde;o:', '</span>', patterns_to_remove),
-        'market_value': lambda: None,
-        'max_52_weeks': lambda: None,
-        'mayer_multiple': lambda: None,
-        'min_52_weeks': lambda: None,
-        'name': lambda: unescape(get_substring(IME_doc[0], 'Nome do Fundo/Classe: </span>', '</span>', patterns_to_remove)),
-        'net_equity_value': lambda: text_to_number(get_substring(IME_doc[0], 'Patrim&ocirc;nio L&iacute;quido &ndash; R$', '</span>', patterns_to_remove)),
-        'price': lambda: None,
-        'pvp': lambda: None,
-        'segment': lambda: unescape(get_substring(IME_doc[0], 'Segmento de Atua&ccedil;&atilde;o:', '</span>', patterns_to_remove)),
-        'target_public': lambda: get_substring(IME_doc[0], 'P&uacute;blico Alvo: </span>', '</span>', patterns_to_remove),
-        'term': lambda: get_substring(IME_doc[0], '>Prazo de Dura&ccedil;&atilde;o: </span>', '</span>', patterns_to_remove),
-        'total_issued_shares': lambda: text_to_number(get_substring(IME_doc[0], 'Quantidade de cotas emitidas: </span>', '</span>', patterns_to_remove)),
-        'total_mortgage': lambda: get_substring(ITE_doc[0], ' 1.2.2', '1.2.6', patterns_to_remove).count('</tr>') - 8,
-        'total_mortgage_value': count_total_mortgage_value,
-        'total_real_state': lambda: ITE_doc[0].count('&Aacute;rea (m2):') + (get_substring(ITE_doc[0], '1.1.1', '>1.1.2<', patterns_to_remove).count('</tr>') - 2),
-        'total_real_state_value': count_total_real_state_value,
-        'total_stocks_fund_others': lambda: (get_substring(ITE_doc[0], ' 1.2.1', ' 1.2.2', patterns_to_remove).count('</tr>') - 2) + (get_substring(ITE_doc[0], ' 1.2.6', '>1.3<', patterns_to_remove).count('</tr>') - 16),
-        'total_stocks_fund_others_value': count_total_stocks_fund_others_value,
-        'type': fii_type,
-        'vacancy': lambda: None,
-        'variation_12m': lambda: None,
-        'variation_30d': lambda: None
-    }
+def extract_info(text, extraction_plan):
+    if not text:
+        return None
+
+    start_text, end_text, cleanup, parser = extraction_plan
+
+    info = get_substring(text, start_text, end_text, cleanup)
+
+    return parser(info) if parser else info
 
-    final_data = { info: ALL_INFO[info]() for info in info_names}
+def run_extraction_plan(text, extraction_plan, derived_info, info_names, *context):
+    final_data = {}
+
+    for info in info_names:
+        if info in extraction_plan:
+            final_data[info] = extract_info(text, extraction_plan[info])
+        elif info in derived_info:
+            final_data[info] = derived_info[info](*context)
+        else:
+            final_data[info] = None
 
     return final_data
 
+BMFBOVESPA_CLEANUP = compile_cleanup([
+    '</b>',
+    '</span>',
+    '</td>',
+    '<b>',
+    '<center>',
+    '<span class="dado-cabecalho">',
+    '<span class="dado-valores">',
+    '<span>',
+    '<td align="center">',
+    '<td>'
+])
+
+BMFBOVESPA_IME_EXTRACTION_PLAN = {
+    'assets_value': ('Ativo &ndash; R$', '</span>', BMFBOVESPA_CLEANUP, parse_number),
+    'cash_value': ('Total mantido para as Necessidades de Liquidez (art. 46, &sect; &uacute;nico, ICVM 472/08) </b>', '</span>', BMFBOVESPA_CLEANUP, parse_number),
+    'debit_by_real_state_acquisition': ('Obriga&ccedil;&otilde;es por aquisi&ccedil;&atilde;o de im&oacute;veis', '</span>', BMFBOVESPA_CLEANUP, parse_number),
+    'debit_by_securitization_receivables_acquisition': ('Obriga&ccedil;&otilde;es por securitiza&ccedil;&atilde;o de receb&iacute;veis', '</span>', BMFBOVESPA_CLEANUP, parse_number),
+    'equity_price': ('Valor Patrimonial das Cotas &ndash; R$', '</span>', BMFBOVESPA_CLEANUP, parse_number),
+    'initial_date': ('doc de Funcionamento:', '</span>', BMFBOVESPA_CLEANUP, None),
+    'management': ('Tipo de Gest&atilde;o:', '</span>', BMFBOVESPA_CLEANUP, None),
+    'name': ('Nome do Fundo/Classe: </span>', '</span>', BMFBOVESPA_CLEANUP, unescape_text),
+    'net_equity_value': ('Patrim&ocirc;nio L&iacute;quido &ndash; R$', '</span>', BMFBOVESPA_CLEANUP, parse_number),
+    'segment': ('Segmento de Atua&ccedil;&atilde;o:', '</span>', BMFBOVESPA_CLEANUP, unescape_text),
+    'target_public': ('P&uacute;blico Alvo: </span>', '</span>', BMFBOVESPA_CLEANUP, None),
+    'term': ('>Prazo de Dura&ccedil;&atilde;o: </span>', '</span>', BMFBOVESPA_CLEANUP, None),
+    'total_issued_shares': ('Quantidade de cotas emitidas: </span>', '</span>', BMFBOVESPA_CLEANUP, parse_number),
+    'total_real_state_value': ('Direitos reais sobre bens im&oacute;veis ', '</span>', BMFBOVESPA_CLEANUP, parse_number)
+}
+
+BMFBOVESPA_MORTGAGE_VALUE_MARKERS = (
+    'Certificados de Dep&oacute;sitos de Valores Mobili&aacute;rios',
+    'Notas Promiss&oacute;rias',
+    'Notas Comerciais',
+    'CRI" (se FIAGRO, Certificado de Receb&iacute;veis do Agroneg&oacute;cio "CRA")',
+    'Hipotec&aacute;rias',
+    'LCI" (se FIAGRO, Letras de Cr&eacute;dito do Agroneg&oacute;cio "LCA")',
+    'LIG)'
+)
+
+BMFBOVESPA_STOCKS_FUND_OTHERS_VALUE_MARKERS = (
+    'A&ccedil;&otilde;es',
+    'Deb&ecirc;ntures',
+    'certificados de desdobramentos',
+    'FIA)',
+    'FIP)',
+    'FII)',
+    'FIDC)',
+    'Outras cotas de Fundos de Investimento',
+    'A&ccedil;&otilde;es de Sociedades cujo &uacute;nico prop&oacute;sito se enquadra entre as atividades permitidas aos FII',
+    'Cotas de Sociedades que se enquadre entre as atividades permitidas aos FII',
+    'CEPAC)',
+    'Outros Valores Mobili&aacute;rios'
+)
+
+def sum_bmfbovespa_values(IME_text, markers):
+    if not IME_text:
+        return None
+
+    values = [ value for value in parse_numbers(get_substring(IME_text, marker, '</span>', BMFBOVESPA_CLEANUP) for marker in markers) if value is not None ]
+
+    return sum(values) if values else None
+
+def count_bmfbovespa_rows(ITE_text, start_text, end_text, offset):
+    if not ITE_text:
+        return None
+
+    rows_text = get_substring(ITE_text, start_text, end_text, BMFBOVESPA_CLEANUP)
+
+    return rows_text.count('</tr>') - offset if rows_text is not None else None
+
+def classify_fii_type(total_stocks_fund_others_value, total_mortgage_value, total_real_state_value):
+    fii_type = {
+        'Outro': total_stocks_fund_others_value,
+        'Papel': total_mortgage_value,
+        'Tijolo': total_real_state_value
+    }
+
+    if not any(value is not None for value in fii_type.values()):
+        return None
+
+    return max(fii_type, key=lambda name: fii_type[name] or 0)
+
+def get_bmfbovespa_fii_type(IME_text):
+    return classify_fii_type(
+        sum_bmfbovespa_values(IME_text, BMFBOVESPA_STOCKS_FUND_OTHERS_VALUE_MARKERS),
+        sum_bmfbovespa_values(IME_text, BMFBOVESPA_MORTGAGE_VALUE_MARKERS),
+        extract_info(IME_text, BMFBOVESPA_IME_EXTRACTION_PLAN['total_real_state_value'])
+    )
+
+def get_bmfbovespa_total_real_state(ITE_text):
+    real_state_rows = count_bmfbovespa_rows(ITE_text, '1.1.1', '>1.1.2<', 2)
+
+    return ITE_text.count('&Aacute;rea (m2):') + real_state_rows if real_state_rows is not None else None
+
+def get_bmfbovespa_total_stocks_fund_others(ITE_text):
+    stocks_rows = count_bmfbovespa_rows(ITE_text, ' 1.2.1', ' 1.2.2', 2)
+    fund_others_rows = count_bmfbovespa_rows(ITE_text, ' 1.2.6', '>1.3<', 16)
+
+    return stocks_rows + fund_others_rows if stocks_rows is not None and fund_others_rows is not None else None
+
+BMFBOVESPA_DERIVED_INFO = {
+    'latest_dividend': lambda IME_text, ITE_text, RA_docs, cnpj: RA_docs[max(RA_docs.keys(), key=lambda date: datetime.strptime(date, "%d%m%Y"))] if len(RA_docs) else None,
+    'latests_dividends': lambda IME_text, ITE_text, RA_docs, cnpj: sum(dividend for dividend in RA_docs.values() if dividend is not None),
+    'link': lambda IME_text, ITE_text, RA_docs, cnpj: f'https://fnet.bmfbovespa.com.br/fnet/publico/abrirGerenciadorDocumentosCVM?cnpjFundo={cnpj}#',
+    'total_mortgage': lambda IME_text, ITE_text, RA_docs, cnpj: count_bmfbovespa_rows(ITE_text, ' 1.2.2', '1.2.6', 8),
+    'total_mortgage_value': lambda IME_text, ITE_text, RA_docs, cnpj: sum_bmfbovespa_values(IME_text, BMFBOVESPA_MORTGAGE_VALUE_MARKERS),
+    'total_real_state': lambda IME_text, ITE_text, RA_docs, cnpj: get_bmfbovespa_total_real_state(ITE_text),
+    'total_stocks_fund_others': lambda IME_text, ITE_text, RA_docs, cnpj: get_bmfbovespa_total_stocks_fund_others(ITE_text),
+    'total_stocks_fund_others_value': lambda IME_text, ITE_text, RA_docs, cnpj: sum_bmfbovespa_values(IME_text, BMFBOVESPA_STOCKS_FUND_OTHERS_VALUE_MARKERS),
+    'type': lambda IME_text, ITE_text, RA_docs, cnpj: get_bmfbovespa_fii_type(IME_text)
+}
+
+INFORME_MENSAL_ESTRUTURADO_DOCUMENT = 'IME'
+INFORME_TRIMESTRAL_ESTRUTURADO_DOCUMENT = 'ITE'
+RENDIMENTOS_AMORTIZACOES_DOCUMENT = 'RA'
+
+BMFBOVESPA_INFO_DOCUMENTS = {
+    **{ info: INFORME_MENSAL_ESTRUTURADO_DOCUMENT for info in BMFBOVESPA_IME_EXTRACTION_PLAN },
+    'latest_dividend': RENDIMENTOS_AMORTIZACOES_DOCUMENT,
+    'latests_dividends': RENDIMENTOS_AMORTIZACOES_DOCUMENT,
+    'total_mortgage': INFORME_TRIMESTRAL_ESTRUTURADO_DOCUMENT,
+    'total_mortgage_value': INFORME_MENSAL_ESTRUTURADO_DOCUMENT,
+    'total_real_state': INFORME_TRIMESTRAL_ESTRUTURADO_DOCUMENT,
+    'total_stocks_fund_others': INFORME_TRIMESTRAL_ESTRUTURADO_DOCUMENT,
+    'total_stocks_fund_others_value': INFORME_MENSAL_ESTRUTURADO_DOCUMENT,
+    'type': INFORME_MENSAL_ESTRUTURADO_DOCUMENT
+}
+
+def get_required_bmfbovespa_documents(info_names):
+    return { BMFBOVESPA_INFO_DOCUMENTS[info] for info in info_names if info in BMFBOVESPA_INFO_DOCUMENTS }
+
+def convert_bmfbovespa_data(IME_doc, ITE_doc, RA_docs, cnpj, info_names):
+    IME_text = first_document(IME_doc)
+    ITE_text = first_document(ITE_doc)
+
+    return run_extraction_plan(IME_text, BMFBOVESPA_IME_EXTRACTION_PLAN, BMFBOVESPA_DERIVED_INFO, info_names, IME_text, ITE_text, RA_docs, cnpj)
+
 def fetch_documents(cnpj, document_configs, info_selector=None):
     headers = {
         'Accept': 'application/json, text/javascript, */*; q=0.01, text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
@@ -397,6 +1050,8 @@ def get_informe_trimestral_estruturado_docs(cnpj):
     }
     return fetch_documents(cnpj, doc_configs)
 
+RENDIMENTOS_AMORTIZACOES_CLEANUP = compile_cleanup('</td><td><span class="dado-valores">')
+
 def get_rendimentos_amortizacoes_docs(cnpj):
     today = datetime.now()
     today_day_month = f'{today.day if today.day >= 10 else f"0{today.day}"}%2F{today.month if today.month >= 10 else f"0{today.month}"}'
@@ -413,17 +1068,15 @@ def get_rendimentos_amortizacoes_docs(cnpj):
 
     RA_docs = fetch_documents(cnpj, doc_configs)
 
-    pattern_to_remove = '</td><td><span class="dado-valores">'
-
-    simplified_RA_doc = { get_substring(doc, 'Data do pagamento', '</span>', pattern_to_remove): text_to_number(get_substring(doc, 'Valor do provento (R$/unidade)', '</span>', pattern_to_remove)) for doc in RA_docs }
+    simplified_RA_doc = { get_substring(doc, 'Data do pagamento', '</span>', RENDIMENTOS_AMORTIZACOES_CLEANUP): parse_number(get_substring(doc, 'Valor do provento (R$/unidade)', '</span>', RENDIMENTOS_AMORTIZACOES_CLEANUP)) for doc in RA_docs }
 
     return simplified_RA_doc
 
+INVESTIDOR10_CNPJ_CLEANUP = compile_cleanup([ '<span>', '</span>', '<div class="value">' ])
+
 def get_cnpj_from_investidor10(ticker):
     global investidor_10_preloaded_data
 
-    patterns_to_remove = [ '<span>', '</span>', '<div class="value">' ]
-
     try:
         headers = {
             'accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
@@ -436,17 +1089,20 @@ def get_cnpj_from_investidor10(ticker):
         response = request_get(f'https://investidor10.com.br/fiis/{ticker}', headers)
         html_cropped_body = response.text[15898:]
 
-        cnpj = get_substring(html_cropped_body, 'CNPJ', '</div>', patterns_to_remove)
+        cnpj = get_substring(html_cropped_body, 'CNPJ', '</div>', INVESTIDOR10_CNPJ_CLEANUP)
 
         if cnpj:
           investidor_10_preloaded_data = (ticker, html_cropped_body)
 
         return cnpj
     except:
+        record_source_failure()
         investidor_10_preloaded_data = (None, None)
         log_error(f'Error fetching CNPJ on Investidor 10 for "{ticker}": {traceback.format_exc()}')
         return None
 
+FIIS_CNPJ_CLEANUP = compile_cleanup('\\')
+
 def get_cnpj_from_fiis(ticker):
     global fiis_preloaded_data
 
@@ -462,17 +1118,20 @@ def get_cnpj_from_fiis(ticker):
         response = request_get(f'https://fiis.com.br/{ticker}', headers=headers)
         html_page = response.text
 
-        cnpj = get_substring(html_page, 'cnpj":"', '"', '\\')
+        cnpj = get_substring(html_page, 'cnpj":"', '"', FIIS_CNPJ_CLEANUP)
 
         if cnpj:
           fiis_preloaded_data = (ticker, html_page)
 
         return cnpj
     except:
+        record_source_failure()
         fiis_preloaded_data = (None, None)
         log_error(f'Error fetching CNPJ on FIIs for "{ticker}": {traceback.format_exc()}')
         return None
 
+FUNDAMENTUS_LINK_CLEANUP = compile_cleanup('#')
+
 def get_cnpj_from_fundamentus(ticker):
     global fundamentus_preloaded_data
 
@@ -489,20 +1148,195 @@ def get_cnpj_from_fundamentus(ticker):
         html_page = response.text
 
         if 'Nenhum papel encontrado' in html_page:
-            raise
+            raise TickerNotFoundError(f'No Fundamentus paper for "{ticker}"')
 
-        cnpj = get_substring(html_page, 'abrirGerenciadorDocumentosCVM?cnpjFundo=', '">Pesquisar Documentos', '#')
+        cnpj = get_substring(html_page, 'abrirGerenciadorDocumentosCVM?cnpjFundo=', '">Pesquisar Documentos', FUNDAMENTUS_LINK_CLEANUP)
 
         if cnpj:
           fundamentus_preloaded_data = (ticker, html_page)
 
         return cnpj
     except:
+        record_source_failure()
         fundamentus_preloaded_data = (None, None)
         log_error(f'Error fetching CNPJ on Fundamentus for "{ticker}": {traceback.format_exc()}')
         return None
 
+CNPJ_NON_DIGITS_PATTERN = re.compile(r'\D')
+CVM_YEAR_PATTERN = re.compile(r'\d{4}')
+
+CVM_INFORME_MENSAL_COLUMNS = {
+    'ativo_passivo': {
+        'cash_value': ('Total_Necessidades_Liquidez',),
+        'debit_by_real_state_acquisition': ('Obrigacoes_Aquisicao_Imoveis',),
+        'debit_by_securitization_receivables_acquisition': ('Obrigacoes_Securitizacao_Recebiveis',),
+        'total_real_state_value': ('Direitos_Bens_Imoveis',)
+    },
+    'complemento': {
+        'assets_value': ('Valor_Ativo',),
+        'equity_price': ('Valor_Patrimonial_Cotas',),
+        'net_equity_value': ('Patrimonio_Liquido',),
+        'total_issued_shares': ('Cotas_Emitidas',)
+    },
+    'geral': {
+        'initial_date': ('Data_Funcionamento',),
+        'management': ('Tipo_Gestao',),
+        'name': ('Nome_Fundo_Classe', 'Nome_Fundo'),
+        'segment': ('Segmento_Atuacao',),
+        'target_public': ('Publico_Alvo',),
+        'term': ('Prazo_Duracao',)
+    }
+}
+
+CVM_INFORME_MENSAL_NUMERIC_INFOS = { 'assets_value', 'cash_value', 'debit_by_real_state_acquisition', 'debit_by_securitization_receivables_acquisition', 'equity_price', 'net_equity_value', 'total_issued_shares', 'total_real_state_value' }
+
+CVM_MORTGAGE_VALUE_COLUMNS = (
+    ('Certificados_Deposito_Valores_Mobiliarios',),
+    ('Notas_Promissorias',),
+    ('Notas_Comerciais',),
+    ('CRI_CRA', 'CRI'),
+    ('Letras_Hipotecarias',),
+    ('LCI_LCA', 'LCI'),
+    ('LIG',)
+)
+
+CVM_STOCKS_FUND_OTHERS_VALUE_COLUMNS = (
+    ('Acoes',),
+    ('Debentures',),
+    ('Bonus_Subscricao',),
+    ('Fundo_Acoes',),
+    ('FIP',),
+    ('FII',),
+    ('FDIC', 'FIDC'),
+    ('Outras_Cotas_FI',),
+    ('Acoes_Sociedades_Atividades_FII',),
+    ('Cotas_Sociedades_Atividades_FII',),
+    ('CEPAC',),
+    ('Outros_Valores_Mobliarios', 'Outros_Valores_Mobiliarios')
+)
+
+def normalize_cnpj(cnpj):
+    return CNPJ_NON_DIGITS_PATTERN.sub('', cnpj) if cnpj else cnpj
+
+def parse_cvm_number(text):
+    try:
+        return float(text) if text else None
+    except ValueError:
+        return None
+
+def parse_cvm_date(text):
+    try:
+        return datetime.strptime(text, '%Y-%m-%d').strftime('%d/%m/%Y') if text else None
+    except ValueError:
+        return text
+
+def get_cvm_column(row, column_names):
+    return next((row[column_name] for column_name in column_names if row.get(column_name)), None)
+
+def sum_cvm_columns(row, columns):
+    values = [ value for value in (parse_cvm_number(get_cvm_column(row, column_names)) for column_names in columns) if value is not None ]
+    return sum(values) if values else None
+
+def convert_cvm_informe_mensal_row(report_type, row):
+    data = {}
+
+    for info, column_names in CVM_INFORME_MENSAL_COLUMNS[report_type].items():
+        value = get_cvm_column(row, column_names)
+        data[info] = parse_cvm_number(value) if info in CVM_INFORME_MENSAL_NUMERIC_INFOS else value
+
+    if report_type == 'geral':
+        data['initial_date'] = parse_cvm_date(data['initial_date'])
+    elif report_type == 'ativo_passivo':
+        data['total_mortgage_value'] = sum_cvm_columns(row, CVM_MORTGAGE_VALUE_COLUMNS)
+        data['total_stocks_fund_others_value'] = sum_cvm_columns(row, CVM_STOCKS_FUND_OTHERS_VALUE_COLUMNS)
+        data['type'] = classify_fii_type(data['total_stocks_fund_others_value'], data['total_mortgage_value'], data['total_real_state_value'])
+
+    return data
+
+def get_cvm_report_type(file_name):
+    return next((report_type for report_type in CVM_INFORME_MENSAL_COLUMNS if f'_{report_type}' in os.path.basename(file_name)), None)
+
+def iterate_cvm_informe_mensal_files(source):
+    if source.startswith('http://') or source.startswith('https://'):
+        source = io.BytesIO(request_get(source).content)
+    elif os.path.isdir(source):
+        for file_name in sorted(os.listdir(source)):
+            file_path = os.path.join(source, file_name)
+            if file_path.endswith('.csv') or zipfile.is_zipfile(file_path):
+                yield from iterate_cvm_informe_mensal_files(file_path)
+        return
+    elif not os.path.exists(source):
+        raise FileNotFoundError(f'CVM Informe Mensal source "{source}" not found')
+    elif not zipfile.is_zipfile(source):
+        if not source.endswith('.csv'):
+            raise Exception(f'Unsupported CVM Informe Mensal source "{source}"')
+
+        with open(source, 'r', encoding='latin-1', newline='') as csv_file:
+            yield source, csv_file
+        return
+
+    with zipfile.ZipFile(source) as zip_file:
+        for file_name in zip_file.namelist():
+            if not file_name.endswith('.csv'):
+                continue
+
+            with zip_file.open(file_name) as csv_file:
+                yield file_name, io.TextIOWrapper(csv_file, encoding='latin-1', newline='')
+
+def convert_cvm_informe_mensal_data(source):
+    reports = {}
+    report_dates = {}
+    total_report_files = 0
+
+    for file_name, csv_file in iterate_cvm_informe_mensal_files(source):
+        report_type = get_cvm_report_type(file_name)
+        if not report_type:
+            continue
+
+        total_report_files += 1
+        log_debug(f'Reading CVM Informe Mensal file {file_name}')
+
+        for row in csv.DictReader(csv_file, delimiter=';'):
+            cnpj = normalize_cnpj(get_cvm_column(row, ('CNPJ_Fundo_Classe', 'CNPJ_Fundo')))
+            report_date = row.get('Data_Referencia', '')
+
+            if not cnpj or report_date < report_dates.get((cnpj, report_type), ''):
+                continue
+
+            report_dates[(cnpj, report_type)] = report_date
+            reports.setdefault(cnpj, FundRecord()).update(convert_cvm_informe_mensal_row(report_type, row))
+
+    if not total_report_files:
+        raise Exception(f'No CVM Informe Mensal report found in "{source}"')
+
+    return reports
+
+def ingest_cvm_informe_mensal(source):
+    reports = convert_cvm_informe_mensal_data(source)
+
+    if reports:
+        upsert_cache_entries(reports, should_refresh_date=True, should_record_changes=False)
+
+    log_info(f'CVM Informe Mensal ingested from "{source}" for {len(reports)} funds')
+    return len(reports)
+
+def get_data_from_cvm_cache(cnpj, info_names):
+    cached_data = read_cache(normalize_cnpj(cnpj), CVM_CACHE_EXPIRY)
+    if not cached_data:
+        return None
+
+    filtered_data = { info: cached_data.get(info) for info in info_names }
+    log_debug(f'Data from CVM Informe Mensal cache: {filtered_data}')
+
+    return filtered_data
+
 def get_data_from_bmfbovespa(ticker, info_names):
+    required_documents = get_required_bmfbovespa_documents(info_names)
+
+    if not required_documents and 'link' not in info_names:
+        log_debug(f'No BM & FBovespa documents required for {info_names}')
+        return { info: None for info in info_names }
+
     try:
         cnpj = (
             get_cnpj_from_fundamentus(ticker) or
@@ -514,9 +1348,17 @@ def get_data_from_bmfbovespa(ticker, info_names):
             log_error(f'No CNPJ found for "{ticker}"')
             return None
 
-        informe_mensal_estruturado_docs = get_informe_mensal_estruturado_docs(cnpj)
-        informe_trimestral_estruturado_docs = get_informe_trimestral_estruturado_docs(cnpj)
-        rendimentos_amortizacoes_docs = get_rendimentos_amortizacoes_docs(cnpj)
+        IME_info_names = [ info for info in info_names if BMFBOVESPA_INFO_DOCUMENTS.get(info) == INFORME_MENSAL_ESTRUTURADO_DOCUMENT ]
+        cvm_data = get_data_from_cvm_cache(cnpj, IME_info_names) if IME_info_names else None
+
+        if cvm_data and all(value is not None for value in cvm_data.values()):
+            required_documents.discard(INFORME_MENSAL_ESTRUTURADO_DOCUMENT)
+
+        log_debug(f'BM & FBovespa documents required: {required_documents}')
+
+        informe_mensal_estruturado_docs = get_informe_mensal_estruturado_docs(cnpj) if INFORME_MENSAL_ESTRUTURADO_DOCUMENT in required_documents else None
+        informe_trimestral_estruturado_docs = get_informe_trimestral_estruturado_docs(cnpj) if INFORME_TRIMESTRAL_ESTRUTURADO_DOCUMENT in required_documents else None
+        rendimentos_amortizacoes_docs = get_rendimentos_amortizacoes_docs(cnpj) if RENDIMENTOS_AMORTIZACOES_DOCUMENT in required_documents else None
 
         converted_data = convert_bmfbovespa_data(
             informe_mensal_estruturado_docs,
@@ -525,84 +1367,82 @@ def get_data_from_bmfbovespa(ticker, info_names):
             cnpj,
             info_names
         )
+
+        if cvm_data:
+            converted_data.update({ info: value for info, value in cvm_data.items() if converted_data[info] is None })
+
         log_debug(f'Converted BM & FBovespa data: {converted_data}')
         return converted_data
     except:
+        record_source_failure()
         log_error(f'Error fetching data on BM & FBovespa for "{ticker}": {traceback.format_exc()}')
         return None
 
-def convert_fundamentus_data(data, historical_prices, info_names):
-    patterns_to_remove = [
-        '</font>',
-        '</span>',
-        '</td>',
-        '<a href="resultado.php?segmento=',
-        '<font color="#306EFF">',
-        '<font color="#F75D59">',
-        '<span class="oscil">',
-        '<span class="txt">',
-        '<td class="data destaque w3">',
-        '<td class="data w1">',
-        '<td class="data w2">',
-        '<td class="data w3">',
-        '<td class="data">'
-    ]
+FUNDAMENTUS_CLEANUP = compile_cleanup([
+    '</font>',
+    '</span>',
+    '</td>',
+    '<a href="resultado.php?segmento=',
+    '<font color="#306EFF">',
+    '<font color="#F75D59">',
+    '<span class="oscil">',
+    '<span class="txt">',
+    '<td class="data destaque w3">',
+    '<td class="data w1">',
+    '<td class="data w2">',
+    '<td class="data w3">',
+    '<td class="data">'
+])
+
+FUNDAMENTUS_CASH_CLEANUP = compile_cleanup([ ', data : [' ])
+
+def parse_fundamentus_vacancy(vacancy_as_text):
+    vacancy_as_text = vacancy_as_text.replace('-', '').strip() if vacancy_as_text else None
+    return parse_number(vacancy_as_text) if vacancy_as_text else None
+
+FUNDAMENTUS_EXTRACTION_PLAN = {
+    'assets_value': ('>Ativos</span>', '</span>', FUNDAMENTUS_CLEANUP, parse_number),
+    'cash_value': ('Caixa\'', ']', FUNDAMENTUS_CASH_CLEANUP, parse_number),
+    'dy': ('Div. Yield</span>', '</span>', FUNDAMENTUS_CLEANUP, parse_number),
+    'equity_price': ('VP/Cota</span>', '</span>', FUNDAMENTUS_CLEANUP, parse_number),
+    'ffoy': ('FFO Yield</span>', '</span>', FUNDAMENTUS_CLEANUP, parse_number),
+    'latest_dividend': ('Dividendo/cota</span>', '</span>', FUNDAMENTUS_CLEANUP, parse_number),
+    'link': ('<a target="_blank" href="', '">Pesquisar', FUNDAMENTUS_LINK_CLEANUP, None),
+    'liquidity': ('Vol $ méd (2m)</span>', '</span>', FUNDAMENTUS_CLEANUP, parse_number),
+    'management': ('Gestão</span>', '</span>', FUNDAMENTUS_CLEANUP, None),
+    'market_value': ('Valor de mercado</span>', '</span>', FUNDAMENTUS_CLEANUP, parse_number),
+    'max_52_weeks': ('Max 52 sem</span>', '</span>', FUNDAMENTUS_CLEANUP, parse_number),
+    'min_52_weeks': ('Min 52 sem</span>', '</span>', FUNDAMENTUS_CLEANUP, parse_number),
+    'name': ('Nome</span>', '</span>', FUNDAMENTUS_CLEANUP, None),
+    'net_equity_value': ('Patrim Líquido</span>', '</span>', FUNDAMENTUS_CLEANUP, parse_number),
+    'price': ('Cotação</span>', '</span>', FUNDAMENTUS_CLEANUP, parse_number),
+    'pvp': ('P/VP</span>', '</span>', FUNDAMENTUS_CLEANUP, parse_number),
+    'segment': ('Mandato</span>', '</span>', FUNDAMENTUS_CLEANUP, None),
+    'total_issued_shares': ('Nro. Cotas</span>', '</span>', FUNDAMENTUS_CLEANUP, parse_number),
+    'total_real_state': ('Qtd imóveis</span>', '</span>', FUNDAMENTUS_CLEANUP, parse_number),
+    'vacancy': ('Vacância Média</span>', '</span>', FUNDAMENTUS_CLEANUP, parse_fundamentus_vacancy),
+    'variation_12m': ('12 meses</span>', '</span>', FUNDAMENTUS_CLEANUP, parse_number),
+    'variation_30d': ('Mês</span>', '</span>', FUNDAMENTUS_CLEANUP, parse_number)
+}
 
+def get_fundamentus_avg_price(historical_prices):
     prices = [ price[1] for price in historical_prices[-200:] ]
-    avg_price = sum(prices) / len(prices)
-    last_price = historical_prices[-1][1]
-
-    def get_vacancy():
-        vacancy_as_text = get_substring(data, 'Vacância Média</span>', '</span>', patterns_to_remove)
-        vacancy_as_text = vacancy_as_text.replace('-', '').strip()
-        return text_to_number(vacancy_as_text) if vacancy_as_text else None
-
-    ALL_INFO = {
-        'actuation': lambda: None,
-        'assets_value': lambda: text_to_number(get_substring(data, '>Ativos</span>', '</span>', patterns_to_remove)),
-        'avg_price': lambda: avg_price,
-        'cash_value': lambda: text_to_number(get_substring(data, 'Caixa\'', ']', [', data : ['])),
-        'debit_by_real_state_acquisition': lambda: None,
-        'debit_by_securitization_receivables_acquisition': lambda: None,
-        'dy': lambda: text_to_number(get_substring(data, 'Div. Yield</span>', '</span>', patterns_to_remove)),
-        'equity_price': lambda: text_to_number(get_substring(data, 'VP/Cota</span>', '</span>', patterns_to_remove)),
-        'ffoy': lambda: text_to_number(get_substring(data, 'FFO Yield</span>', '</span>', patterns_to_remove)),
-        'initial_date': lambda: None,
-        'latest_dividend': lambda: text_to_number(get_substring(data, 'Dividendo/cota</span>', '</span>', patterns_to_remove)),
-        'latests_dividends': lambda: None,
-        'link': lambda: get_substring(data, '<a target="_blank" href="', '">Pesquisar', '#'),
-        'liquidity': lambda: text_to_number(get_substring(data, 'Vol $ méd (2m)</span>', '</span>', patterns_to_remove)),
-        'management': lambda: get_substring(data, 'Gestão</span>', '</span>', patterns_to_remove),
-        'market_value': lambda: text_to_number(get_substring(data, 'Valor de mercado</span>', '</span>', patterns_to_remove)),
-        'max_52_weeks': lambda: text_to_number(get_substring(data, 'Max 52 sem</span>', '</span>', patterns_to_remove)),
-        #'max_52_weeks': lambda: max(prices),
-        'mayer_multiple': lambda: last_price / avg_price,
-        'min_52_weeks': lambda: text_to_number(get_substring(data, 'Min 52 sem</span>', '</span>', patterns_to_remove)),
-        #'min_52_weeks': lambda: min(prices),
-        'name': lambda: get_substring(data, 'Nome</span>', '</span>', patterns_to_remove),
-        'net_equity_value': lambda: text_to_number(get_substring(data, 'Patrim Líquido</span>', '</span>', patterns_to_remove)),
-        'price': lambda: text_to_number(get_substring(data, 'Cotação</span>', '</span>', patterns_to_remove)),
-        #'price': lambda: last_price,
-        'pvp': lambda: text_to_number(get_substring(data, 'P/VP</span>', '</span>', patterns_to_remove)),
-        'segment': lambda: get_substring(data, 'Mandato</span>', '</span>', patterns_to_remove),
-        'target_public': lambda: None,
-        'term': lambda: None,
-        'total_issued_shares': lambda: text_to_number(get_substring(data, 'Nro. Cotas</span>', '</span>', patterns_to_remove)),
-        'total_mortgage': lambda: None,
-        'total_mortgage_value': lambda: None,
-        'total_real_state': lambda: text_to_number(get_substring(data, 'Qtd imóveis</span>', '</span>', patterns_to_remove)),
-        'total_real_state_value': lambda: None,
-        'total_stocks_fund_others': lambda: None,
-        'total_stocks_fund_others_value': lambda: None,
-        'type': lambda: None,
-        'vacancy': get_vacancy,
-        'variation_12m': lambda: text_to_number(get_substring(data, '12 meses</span>', '</span>', patterns_to_remove)),
-        'variation_30d': lambda: text_to_number(get_substring(data, 'Mês</span>', '</span>', patterns_to_remove))
-    }
-
-    final_data = { info: ALL_INFO[info]() for info in info_names}
+    return sum(prices) / len(prices) if prices else None
+
+def get_fundamentus_mayer_multiple(historical_prices):
+    avg_price = get_fundamentus_avg_price(historical_prices)
+    return historical_prices[-1][1] / avg_price if avg_price else None
+
+FUNDAMENTUS_DERIVED_INFO = {
+    'avg_price': get_fundamentus_avg_price,
+    #'max_52_weeks': lambda historical_prices: max(price[1] for price in historical_prices),
+    'mayer_multiple': get_fundamentus_mayer_multiple,
+    #'min_52_weeks': lambda historical_prices: min(price[1] for price in historical_prices),
+    #'price': lambda historical_prices: historical_prices[-1][1],
+}
 
-    return final_data
+def convert_fundamentus_data(data, historical_prices, info_names):
+    return run_extraction_plan(data, FUNDAMENTUS_EXTRACTION_PLAN, FUNDAMENTUS_DERIVED_INFO, info_names, historical_prices)
 
 def get_data_from_fundamentus(ticker, info_names):
     global fundamentus_preloaded_data
@@ -623,6 +1463,9 @@ def get_data_from_fundamentus(ticker, info_names):
         response = request_get(f'https://fundamentus.com.br/detalhes.php?papel={ticker}', headers)
         html_page = response.text
 
+        if 'Nenhum papel encontrado' in html_page:
+            raise TickerNotFoundError(f'No Fundamentus paper for "{ticker}"')
+
         log_debug(f'Using fresh Fundamentus data')
         return html_page
 
@@ -636,54 +1479,144 @@ def get_data_from_fundamentus(ticker, info_names):
         log_debug(f'Converted Fundamentus data: {converted_data}')
         return converted_data
     except:
+        record_source_failure()
         log_error(f'Error fetching data on Fundamentus for "{ticker}": {traceback.format_exc()}')
         return None
 
-def convert_fiis_data(data, info_names):
-    ALL_INFO = {
-        'actuation': lambda: data['category'][0] if 'valor' in data['meta'] else None,
-        'assets_value': lambda: None,
-        'avg_price': lambda: None,
-        'cash_value': lambda: data['meta']['valor_caixa'] if 'gestao' in data['meta'] else None,
-        'debit_by_real_state_acquisition': lambda: None,
-        'debit_by_securitization_receivables_acquisition': lambda: None,
-        'dy': lambda: data['meta']['dy'] if 'dy' in data['meta'] else None,
-        'equity_price': lambda: data['meta']['valorpatrimonialcota'] if 'valorpatrimonialcota' in data['meta'] else None,
-        'ffoy': lambda: None,
-        'initial_date': lambda: data['meta']['firstdate'] if 'firstdate' in data['meta'] else None,
-        'latest_dividend': lambda: data['meta']['lastdividend'] if 'lastdividend' in data['meta'] else None,
-        'latests_dividends': lambda: data['meta']['currentsumdividends'] if 'avgdividend' in data['meta'] else None,
-        'link': lambda: f'https://fnet.bmfbovespa.com.br/fnet/publico/abrirGerenciadorDocumentosCVM?cnpjFundo={data["meta"]["cnpj"]}#',
-        'liquidity': lambda: data['meta']['liquidezmediadiaria'] if 'liquidezmediadiaria' in data['meta'] else None,
-        'management': lambda: data['meta']['gestao'] if 'valor_caixa' in data['meta'] else None,
-        'market_value': lambda: data['meta']['valormercado'] if 'valormercado' in data['meta'] else None,
-        'max_52_weeks': lambda: data['meta']['max_52_semanas'] if 'max_52_semanas' in data['meta'] else None,
-        'mayer_multiple': lambda: None,
-        'min_52_weeks': lambda: data['meta']['min_52_semanas'] if 'min_52_semanas' in data['meta'] else None,
-        'name': lambda: data['meta']['name'] if 'name' in data['meta'] else None,
-        'net_equity_value': lambda: data['meta']['patrimonio'] if 'patrimonio' in data['meta'] else None,
-        'price': lambda: data['meta']['valor'] if 'valor' in data['meta'] else None,
-        'pvp': lambda: data['meta']['pvp'] if 'pvp' in data['meta'] else None,
-        'segment': lambda: data['meta']['segmento_ambima'] if 'segmento_ambima' in data['meta'] else None,
-        'target_public': lambda: data['meta']['publicoalvo'] if 'publicoalvo' in data['meta'] else None,
-        'term': lambda: data['meta']['prazoduracao'] if 'prazoduracao' in data['meta'] else None,
-        'total_issued_shares': lambda: data['meta']['numero_cotas'] if 'numero_cotas' in data['meta'] else None,
-        'total_mortgage': lambda: None,
-        'total_mortgage_value': lambda: None,
-        'total_real_state': lambda: data['meta']['assets_number'] if 'assets_number' in data['meta'] else None,
-        'total_real_state_value': lambda: None,
-        'total_stocks_fund_others': lambda: None,
-        'total_stocks_fund_others_value': lambda: None,
-        'type': lambda: data['meta']['setor_atuacao'] if 'setor_atuacao' in data['meta'] else None,
-        'vacancy': lambda: data['meta']['vacancia'] if 'vacancia' in data['meta'] else None,
-        'variation_12m': lambda: data['meta']['valorizacao_12_meses'] if 'valorizacao_12_meses' in data['meta'] else None,
-        'variation_30d': lambda: data['meta']['valorizacao_mes'] if 'valorizacao_mes' in data['meta'] else None
-    }
+FIIS_META_PLAN = {
+    'cash_value': ('valor_caixa', 'gestao'),
+    'dy': ('dy', 'dy'),
+    'equity_price': ('valorpatrimonialcota', 'valorpatrimonialcota'),
+    'initial_date': ('firstdate', 'firstdate'),
+    'latest_dividend': ('lastdividend', 'lastdividend'),
+    'latests_dividends': ('currentsumdividends', 'avgdividend'),
+    'liquidity': ('liquidezmediadiaria', 'liquidezmediadiaria'),
+    'management': ('gestao', 'valor_caixa'),
+    'market_value': ('valormercado', 'valormercado'),
+    'max_52_weeks': ('max_52_semanas', 'max_52_semanas'),
+    'min_52_weeks': ('min_52_semanas', 'min_52_semanas'),
+    'name': ('name', 'name'),
+    'net_equity_value': ('patrimonio', 'patrimonio'),
+    'price': ('valor', 'valor'),
+    'pvp': ('pvp', 'pvp'),
+    'segment': ('segmento_ambima', 'segmento_ambima'),
+    'target_public': ('publicoalvo', 'publicoalvo'),
+    'term': ('prazoduracao', 'prazoduracao'),
+    'total_issued_shares': ('numero_cotas', 'numero_cotas'),
+    'total_real_state': ('assets_number', 'assets_number'),
+    'type': ('setor_atuacao', 'setor_atuacao'),
+    'vacancy': ('vacancia', 'vacancia'),
+    'variation_12m': ('valorizacao_12_meses', 'valorizacao_12_meses'),
+    'variation_30d': ('valorizacao_mes', 'valorizacao_mes')
+}
 
-    final_data = { info: ALL_INFO[info]() for info in info_names }
+FIIS_DERIVED_INFO = {
+    'actuation': lambda data: data['category'][0] if 'valor' in data['meta'] else None,
+    'link': lambda data: f'https://fnet.bmfbovespa.com.br/fnet/publico/abrirGerenciadorDocumentosCVM?cnpjFundo={data["meta"]["cnpj"]}#'
+}
+
+def run_meta_plan(data, meta_plan, derived_info, info_names):
+    meta = data['meta']
+    final_data = {}
+
+    for info in info_names:
+        if info in meta_plan:
+            meta_key, required_meta_key = meta_plan[info]
+            final_data[info] = meta[meta_key] if required_meta_key in meta else None
+        elif info in derived_info:
+            final_data[info] = derived_info[info](data)
+        else:
+            final_data[info] = None
 
     return final_data
 
+FUNDAMENTUS_LISTING_COLUMNS = {
+    'Cotação': 'price',
+    'Dividend Yield': 'dy',
+    'FFO Yield': 'ffoy',
+    'Liquidez': 'liquidity',
+    'P/VP': 'pvp',
+    'Vacância Média': 'vacancy',
+    'Valor de Mercado': 'market_value'
+}
+FUNDAMENTUS_LISTING_ROW_PATTERN = re.compile(r'<tr[^>]*>(.*?)</tr>', re.DOTALL)
+FUNDAMENTUS_LISTING_HEADER_PATTERN = re.compile(r'<th[^>]*>(.*?)</th>', re.DOTALL)
+FUNDAMENTUS_LISTING_CELL_PATTERN = re.compile(r'<td[^>]*>(.*?)</td>', re.DOTALL)
+
+def convert_fundamentus_listing_data(html_page):
+    table = get_substring(html_page, 'id="tabelaResultado"', '</table>')
+    if not table:
+        return {}
+
+    headers = [ unescape(HTML_TAG_PATTERN.sub('', header)).strip() for header in FUNDAMENTUS_LISTING_HEADER_PATTERN.findall(table) ]
+    columns = [ (index, FUNDAMENTUS_LISTING_COLUMNS[header]) for index, header in enumerate(headers) if header in FUNDAMENTUS_LISTING_COLUMNS ]
+
+    listing = {}
+
+    for row in FUNDAMENTUS_LISTING_ROW_PATTERN.findall(table):
+        cells = [ HTML_TAG_PATTERN.sub('', cell).strip() for cell in FUNDAMENTUS_LISTING_CELL_PATTERN.findall(row) ]
+        if not cells or len(cells) != len(headers):
+            continue
+
+        listing[cells[0].upper()] = FundRecord({ info: parse_number(cells[index]) for index, info in columns })
+
+    return listing
+
+def get_fundamentus_listing():
+    global fundamentus_listing_data
+
+    listing_date, listing = fundamentus_listing_data
+    if listing and datetime.now() - listing_date <= FUNDAMENTUS_LISTING_EXPIRY:
+        log_debug(f'Using preloaded Fundamentus listing (Date: {listing_date.strftime(DATE_FORMAT)})')
+        return listing
+
+    headers = {
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
+        'Accept-Language': 'pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7',
+        'Origin': 'https://fundamentus.com.br/index.php',
+        'Referer': 'https://fundamentus.com.br/index.php',
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36 OPR/113.0.0.0'
+    }
+
+    try:
+        response = request_get('https://www.fundamentus.com.br/fii_resultado.php', headers)
+        new_listing = convert_fundamentus_listing_data(response.text)
+
+        if not new_listing:
+            raise Exception('Empty Fundamentus listing')
+
+        fundamentus_listing_data = (datetime.now(), new_listing)
+        known_tickers.update(new_listing)
+        log_info(f'Fundamentus listing loaded with {len(new_listing)} FIIs')
+
+        upsert_cache_entries(new_listing)
+
+        return new_listing
+    except:
+        log_error(f'Error fetching Fundamentus listing: {traceback.format_exc()}')
+        return None
+
+def get_data_from_fundamentus_listing(ticker, info_names):
+    listing_info_names = [ info for info in info_names if info in FUNDAMENTUS_LISTING_COLUMNS.values() ]
+    if not listing_info_names:
+        return None
+
+    try:
+        listing = get_fundamentus_listing()
+        if not listing or ticker not in listing:
+            return None
+
+        converted_data = { info: listing[ticker].get(info) for info in listing_info_names }
+        log_debug(f'Converted Fundamentus listing data: {converted_data}')
+        return converted_data
+    except:
+        record_source_failure()
+        log_error(f'Error fetching data on Fundamentus listing for "{ticker}": {traceback.format_exc()}')
+        return None
+
+def convert_fiis_data(data, info_names):
+    return run_meta_plan(data, FIIS_META_PLAN, FIIS_DERIVED_INFO, info_names)
+
 def get_data_from_fiis(ticker, info_names):
     global fiis_preloaded_data
 
@@ -712,53 +1645,17 @@ def get_data_from_fiis(ticker, info_names):
         log_debug(f'Converted fresh FIIs data: {converted_data}')
         return converted_data
     except:
+        record_source_failure()
         log_error(f'Error fetching data on FIIs for "{ticker}": {traceback.format_exc()}')
         return None
 
-def convert_fundsexplorer_data(data, info_names):
-    ALL_INFO = {
-        'actuation': lambda: data['category'][0] if 'valor' in data['meta'] else None,
-        'assets_value': lambda: None,
-        'avg_price': lambda: None,
-        'cash_value': lambda: data['meta']['valor_caixa'] if 'gestao' in data['meta'] else None,
-        'debit_by_real_state_acquisition': lambda: None,
-        'debit_by_securitization_receivables_acquisition': lambda: None,
-        'dy': lambda: data['meta']['dy'] if 'dy' in data['meta'] else None,
-        'equity_price': lambda: data['meta']['valorpatrimonialcota'] if 'valorpatrimonialcota' in data['meta'] else None,
-        'ffoy': lambda: None,
-        'initial_date': lambda: data['meta']['firstdate'] if 'firstdate' in data['meta'] else None,
-        'latest_dividend': lambda: data['meta']['lastdividend'] if 'lastdividend' in data['meta'] else None,
-        'latests_dividends': lambda: data['meta']['dividendos_12_meses'] if 'dividendos_12_meses' in data['meta'] else None,
-        'link': lambda: f'https://fnet.bmfbovespa.com.br/fnet/publico/abrirGerenciadorDocumentosCVM?cnpjFundo={data["meta"]["cnpj"]}#',
-        'liquidity': lambda: data['meta']['liquidezmediadiaria'] if 'liquidezmediadiaria' in data['meta'] else None,
-        'management': lambda: data['meta']['gestao'] if 'valor_caixa' in data['meta'] else None,
-        'market_value': lambda: data['meta']['valormercado'] if 'valormercado' in data['meta'] else None,
-        'max_52_weeks': lambda: data['meta']['max_52_semanas'] if 'max_52_semanas' in data['meta'] else None,
-        'mayer_multiple': lambda: None,
-        'min_52_weeks': lambda: data['meta']['min_52_semanas'] if 'min_52_semanas' in data['meta'] else None,
-        'name': lambda: data['meta']['name'] if 'name' in data['meta'] else None,
-        'net_equity_value': lambda: data['meta']['patrimonio'] if 'patrimonio' in data['meta'] else None,
-        'price': lambda: data['meta']['valor'] if 'valor' in data['meta'] else None,
-        'pvp': lambda: data['meta']['pvp'] if 'pvp' in data['meta'] else None,
-        'segment': lambda: data['meta']['segmento_ambima'] if 'segmento_ambima' in data['meta'] else None,
-        'target_public': lambda: data['meta']['publicoalvo'] if 'publicoalvo' in data['meta'] else None,
-        'term': lambda: data['meta']['prazoduracao'] if 'prazoduracao' in data['meta'] else None,
-        'total_issued_shares': lambda: data['meta']['numero_cotas'] if 'numero_cotas' in data['meta'] else None,
-        'total_mortgage_value': lambda: None,
-        'total_mortgage': lambda: None,
-        'total_real_state_value': lambda: None,
-        'total_real_state': lambda: data['meta']['assets_number'] if 'assets_number' in data['meta'] else None,
-        'total_stocks_fund_others_value': lambda: None,
-        'total_stocks_fund_others': lambda: None,
-        'type': lambda: data['meta']['setor_atuacao'] if 'setor_atuacao' in data['meta'] else None,
-        'vacancy': lambda: data['meta']['vacancia'] if 'vacancia' in data['meta'] else None,
-        'variation_12m': lambda: data['meta']['valorizacao_12_meses'] if 'valorizacao_12_meses' in data['meta'] else None,
-        'variation_30d': lambda: data['meta']['valorizacao_mes'] if 'valorizacao_mes' in data['meta'] else None
-    }
-
-    final_data = { info: ALL_INFO[info]() for info in info_names }
+FUNDSEXPLORER_META_PLAN = {
+    **FIIS_META_PLAN,
+    'latests_dividends': ('dividendos_12_meses', 'dividendos_12_meses')
+}
 
-    return final_data
+def convert_fundsexplorer_data(data, info_names):
+    return run_meta_plan(data, FUNDSEXPLORER_META_PLAN, FIIS_DERIVED_INFO, info_names)
 
 def get_data_from_fundsexplorer(ticker, info_names):
     try:
@@ -782,79 +1679,56 @@ def get_data_from_fundsexplorer(ticker, info_names):
         log_debug(f'Converted Fundsexplorer: {converted_data}')
         return converted_data
     except:
+        record_source_failure()
         log_error(f'Error fetching data on Fundsexplorer for "{ticker}": {traceback.format_exc()}')
         return None
 
-def convert_investidor10_data(data, info_names):
-    patterns_to_remove = [
-        '</div>',
-        '</span>',
-        '<div class="_card-body">',
-        '<div class="value">',
-        '<div>',
-        '<span class="content--info--item--value">',
-        '<span class="value">',
-        '<span>'
-    ]
-
-    def multiply_by_unit(data):
-        if not data:
-            return None
+INVESTIDOR10_CLEANUP = compile_cleanup([
+    '</div>',
+    '</span>',
+    '<div class="_card-body">',
+    '<div class="value">',
+    '<div>',
+    '<span class="content--info--item--value">',
+    '<span class="value">',
+    '<span>'
+])
+
+INVESTIDOR10_EXTRACTION_PLAN = {
+    'dy': ('DY (12M)</span>', '</span>', INVESTIDOR10_CLEANUP, parse_number),
+    'equity_price': ('VAL. PATRIMONIAL P/ COTA', '<div class=\'cell\'>', INVESTIDOR10_CLEANUP, parse_number),
+    'latest_dividend': ('ÚLTIMO RENDIMENTO', '</div>', INVESTIDOR10_CLEANUP, parse_number),
+    'liquidity': ('title="Liquidez Diária">Liquidez Diária</span>', '</span>', INVESTIDOR10_CLEANUP, parse_number),
+    'management': ('TIPO DE GESTÃO', '<div class=\'cell\'>', INVESTIDOR10_CLEANUP, None),
+    'name': ('Razão Social', '<div class=\'cell\'>', INVESTIDOR10_CLEANUP, None),
+    'net_equity_value': ('VALOR PATRIMONIAL</span>', '</span>', INVESTIDOR10_CLEANUP, parse_number),
+    'price': ('Cotação</span>', '</span>', INVESTIDOR10_CLEANUP, parse_number),
+    'pvp': ('title="P/VP">P/VP</span>', '</span>', INVESTIDOR10_CLEANUP, parse_number),
+    'segment': ('SEGMENTO', '<div class=\'cell\'>', INVESTIDOR10_CLEANUP, None),
+    'target_public': ('PÚBLICO-ALVO', '<div class=\'cell\'>', INVESTIDOR10_CLEANUP, None),
+    'term': ('PRAZO DE DURAÇÃO', '<div class=\'cell\'>', INVESTIDOR10_CLEANUP, None),
+    'total_issued_shares': ('COTAS EMITIDAS', '<div class=\'cell\'>', INVESTIDOR10_CLEANUP, parse_number),
+    'type': ('TIPO DE FUNDO', '<div class=\'cell\'>', INVESTIDOR10_CLEANUP, None),
+    'vacancy': ('VACÂNCIA', '<div class=\'cell\'>', INVESTIDOR10_CLEANUP, parse_number),
+    'variation_12m': ('title="Variação (12M)">VARIAÇÃO (12M)</span>', '</span>', INVESTIDOR10_CLEANUP, parse_number)
+}
 
-        if 'K' in data:
-            return text_to_number(data.replace('Mil', '').replace('K', '')) * 1_000
-        elif 'M' in data:
-            return text_to_number(data.replace('Milhão', '').replace('Milhões', '').replace('M', '')) * 1_000_000
-        elif 'B' in data:
-            return text_to_number(data.replace('Bilhão', '').replace('Bilhões', '').replace('B', '')) * 1_000_000_000
-
-        return text_to_number(data)
-
-    count_pattern_on_text = lambda text, pattern: None if not text or not pattern else len(text.split(pattern))
-
-    ALL_INFO = {
-        'actuation': lambda: None,
-        'assets_value': lambda: None,
-        'avg_price': lambda: None,
-        'cash_value': lambda: None,
-        'debit_by_real_state_acquisition': lambda: None,
-        'debit_by_securitization_receivables_acquisition': lambda: None,
-        'dy': lambda: text_to_number(get_substring(data, 'DY (12M)</span>', '</span>', patterns_to_remove)),
-        'equity_price': lambda: text_to_number(get_substring(data, 'VAL. PATRIMONIAL P/ COTA', '<div class=\'cell\'>', patterns_to_remove)),
-        'ffoy': lambda: None,
-        'initial_date': lambda: None,
-        'latest_dividend': lambda: text_to_number(get_substring(data, 'ÚLTIMO RENDIMENTO', '</div>', patterns_to_remove)),
-        'latests_dividends': lambda: text_to_number(get_substring(get_substring(data, 'YIELD 12 MESES', '</div>'), 'amount">', '</span>', patterns_to_remove)),
-        'link': lambda: f'https://fnet.bmfbovespa.com.br/fnet/publico/abrirGerenciadorDocumentosCVM?cnpjFundo={get_substring(data, "CNPJ", "</div>", patterns_to_remove)}#',
-        'liquidity': lambda: multiply_by_unit(get_substring(data, 'title="Liquidez Diária">Liquidez Diária</span>', '</span>', patterns_to_remove)),
-        'management': lambda: get_substring(data, 'TIPO DE GESTÃO', '<div class=\'cell\'>', patterns_to_remove),
-        'market_value': lambda: None,
-        'max_52_weeks': lambda: None,
-        'mayer_multiple': lambda: None,
-        'min_52_weeks': lambda: None,
-        'name': lambda: get_substring(data, 'Razão Social', '<div class=\'cell\'>', patterns_to_remove),
-        'net_equity_value': lambda: multiply_by_unit(get_substring(data, 'VALOR PATRIMONIAL</span>', '</span>', patterns_to_remove)),
-        'price': lambda: text_to_number(get_substring(data, 'Cotação</span>', '</span>', patterns_to_remove)),
-        'pvp': lambda: text_to_number(get_substring(data, 'title="P/VP">P/VP</span>', '</span>', patterns_to_remove)),
-        'segment': lambda: get_substring(data, 'SEGMENTO', '<div class=\'cell\'>', patterns_to_remove),
-        'target_public': lambda: get_substring(data, 'PÚBLICO-ALVO', '<div class=\'cell\'>', patterns_to_remove),
-        'term': lambda: get_substring(data, 'PRAZO DE DURAÇÃO', '<div class=\'cell\'>', patterns_to_remove),
-        'total_issued_shares': lambda: text_to_number(get_substring(data, 'COTAS EMITIDAS', '<div class=\'cell\'>', patterns_to_remove)),
-        'total_mortgage': lambda: None,
-        'total_mortgage_value': lambda: None,
-        'total_real_state': lambda: count_pattern_on_text(get_substring(data, 'Lista de Imóveis', '</section>'), 'card-propertie'),
-        'total_real_state_value': lambda: None,
-        'total_stocks_fund_others': lambda: None,
-        'total_stocks_fund_others_value': lambda: None,
-        'type': lambda: get_substring(data, 'TIPO DE FUNDO', '<div class=\'cell\'>', patterns_to_remove),
-        'vacancy': lambda: text_to_number(get_substring(data, 'VACÂNCIA', '<div class=\'cell\'>', patterns_to_remove)),
-        'variation_12m': lambda: text_to_number(get_substring(data, 'title="Variação (12M)">VARIAÇÃO (12M)</span>', '</span>', patterns_to_remove)),
-        'variation_30d': lambda: None
-    }
+def get_investidor10_latests_dividends(data):
+    yield_text = get_substring(data, 'YIELD 12 MESES', '</div>')
+    return parse_number(get_substring(yield_text, 'amount">', '</span>', INVESTIDOR10_CLEANUP)) if yield_text else None
 
-    final_data = { info: ALL_INFO[info]() for info in info_names }
+def get_investidor10_total_real_state(data):
+    real_state_text = get_substring(data, 'Lista de Imóveis', '</section>')
+    return len(real_state_text.split('card-propertie')) if real_state_text else None
 
-    return final_data
+INVESTIDOR10_DERIVED_INFO = {
+    'latests_dividends': get_investidor10_latests_dividends,
+    'link': lambda data: f'https://fnet.bmfbovespa.com.br/fnet/publico/abrirGerenciadorDocumentosCVM?cnpjFundo={get_substring(data, "CNPJ", "</div>", INVESTIDOR10_CLEANUP)}#',
+    'total_real_state': get_investidor10_total_real_state
+}
+
+def convert_investidor10_data(data, info_names):
+    return run_extraction_plan(data, INVESTIDOR10_EXTRACTION_PLAN, INVESTIDOR10_DERIVED_INFO, info_names, data)
 
 def get_data_from_investidor10(ticker, info_names):
     global investidor_10_preloaded_data
@@ -880,119 +1754,299 @@ def get_data_from_investidor10(ticker, info_names):
         log_debug(f'Converted fresh Investidor 10 data: {converted_data}')
         return converted_data
     except:
+        record_source_failure()
         log_error(f'Error fetching data on Investidor 10 for "{ticker}": {traceback.format_exc()}')
         return None
 
-def filter_remaining_infos(data, info_names, default_info_names=None):
-    if not data:
-        return info_names
-
-    missing_info = [ info for info in info_names if info in data and data[info] is None ]
-
-    return missing_info if missing_info else default_info_names
-
-def combine_data(first_dict, second_dict, info_names):
-    if first_dict and second_dict:
-        combined_dict = {**first_dict, **second_dict}
-        log_debug(f'Data from combined Frist and Second Dictionaries: {combined_dict}')
-    elif first_dict:
-        combined_dict = first_dict
-        log_debug(f'Data from First Dictionary only: {combined_dict}')
-    elif second_dict:
-        combined_dict = second_dict
-        log_debug(f'Data from Second Dictionary only: {combined_dict}')
-    else:
-        combined_dict = {}
+def merge_source_data(combined_data, source_data):
+    combined_data.update({ info: value for info, value in source_data.items() if value is not None or info not in combined_data })
+
+def combine_source_data(source_events, info_names):
+    combined_data = {}
+    should_update_cache = False
+
+    for source_name, source_data in source_events:
+        if not source_data:
+            continue
+
+        merge_source_data(combined_data, source_data)
+        should_update_cache = should_update_cache or source_name != CACHE_SOURCE
+
+    if not combined_data:
         log_debug('No combined data')
+        return False, None
+
+    log_debug(f'Combined data: {combined_data}')
+    return should_update_cache, { info: combined_data.get(info) for info in info_names }
+
+def iterate_data_from_all_sources(ticker, info_names):
+    data_fundamentus_listing = get_data_from_fundamentus_listing(ticker, info_names)
+    log_info(f'Data from Fundamentus listing: {data_fundamentus_listing}')
 
-    missing_combined_infos = filter_remaining_infos(combined_dict, info_names)
-    log_debug(f'Missing info from Combined data: {missing_combined_infos}')
-    return combined_dict, missing_combined_infos
+    if data_fundamentus_listing:
+        yield FUNDAMENTUS_LISTING_SOURCE, data_fundamentus_listing
 
-def get_data_from_all_sources(ticker, info_names):
-    data_bmfbovespa = get_data_from_bmfbovespa(ticker, info_names)
-    log_info(f'Data from BM & FBovespa: {data_bmfbovespa}')
+        info_names = [ info for info in info_names if data_fundamentus_listing.get(info) is None ]
+        log_debug(f'Missing info from Fundamentus listing: {info_names}')
 
-    missing_bmfbovespa_infos = filter_remaining_infos(data_bmfbovespa, info_names)
-    log_debug(f'Missing info from BM & FBovespa: {missing_bmfbovespa_infos}')
+    if info_names:
+        yield from iterate_data_from_source_chain(ticker, info_names)
 
-    if data_bmfbovespa and not missing_bmfbovespa_infos:
-        return data_bmfbovespa
+SOURCE_CHAIN = [
+    (VALID_SOURCES['BMFBOVESPA_SOURCE'], get_data_from_bmfbovespa),
+    (VALID_SOURCES['FUNDAMENTUS_SOURCE'], get_data_from_fundamentus),
+    (VALID_SOURCES['FIIS_SOURCE'], get_data_from_fiis),
+    (VALID_SOURCES['INVESTIDOR10_SOURCE'], get_data_from_investidor10)
+]
 
-    data_fundamentus = get_data_from_fundamentus(ticker, missing_bmfbovespa_infos or info_names)
-    log_info(f'Data from Fundamentus: {data_fundamentus}')
+SOURCE_SUPPORTED_INFOS = {
+    VALID_SOURCES['BMFBOVESPA_SOURCE']: { *BMFBOVESPA_INFO_DOCUMENTS, *BMFBOVESPA_DERIVED_INFO },
+    VALID_SOURCES['FIIS_SOURCE']: { *FIIS_META_PLAN, *FIIS_DERIVED_INFO },
+    VALID_SOURCES['FUNDAMENTUS_SOURCE']: { *FUNDAMENTUS_EXTRACTION_PLAN, *FUNDAMENTUS_DERIVED_INFO },
+    VALID_SOURCES['INVESTIDOR10_SOURCE']: { *INVESTIDOR10_EXTRACTION_PLAN, *INVESTIDOR10_DERIVED_INFO }
+}
 
-    combined_data, missing_combined_infos = combine_data(data_bmfbovespa, data_fundamentus, info_names)
-    log_debug(f'Missing info from BM & FBovespa or Fundamentus: {missing_combined_infos}')
+# Sources disagree on what these mean, so they always follow SOURCE_CHAIN order
+SOURCE_ORDERED_INFOS = frozenset([ 'initial_date', 'management', 'name', 'segment', 'target_public', 'term', 'total_real_state', 'type' ])
 
-    if combined_data and not missing_combined_infos:
-        return combined_data
+SOURCE_STATISTICS_WEIGHT = 0.2
 
-    data_fiis = get_data_from_fiis(ticker, missing_combined_infos or info_names)
-    log_info(f'Data from FIIs: {data_fiis}')
+source_statistics = {}
 
-    combined_data, missing_combined_infos = combine_data(combined_data, data_fiis, info_names)
-    log_debug(f'Missing info from BM & FBovespa, Fundamentus or FIIs: {missing_combined_infos}')
+def update_rolling_average(average, value):
+    return value if average is None else average + SOURCE_STATISTICS_WEIGHT * (value - average)
 
-    if combined_data and not missing_combined_infos:
-        return combined_data
+def record_source_statistics(source, info_names, data, latency):
+    statistics = source_statistics.setdefault(source, { 'latency': None, 'samples': 0, 'success_rate': None, 'non_null_rates': {} })
 
-    data_investidor_10 = get_data_from_investidor10(ticker, missing_combined_infos or info_names)
-    log_info(f'Data from Investidor 10: {data_investidor_10}')
+    statistics['latency'] = update_rolling_average(statistics['latency'], latency)
+    statistics['samples'] += 1
+    statistics['success_rate'] = update_rolling_average(statistics['success_rate'], 1 if data else 0)
 
-    if not data_investidor_10:
-        return combined_data
+    if not data:
+        return
 
-    return { **combined_data, **data_investidor_10 }
+    non_null_rates = statistics['non_null_rates']
+    for info in info_names:
+        non_null_rates[info] = update_rolling_average(non_null_rates.get(info), 0 if data.get(info) is None else 1)
 
-def get_data_from_sources(ticker, source, info_names):
-    SOURCES = {
-        VALID_SOURCES['BMFBOVESPA_SOURCE']: get_data_from_bmfbovespa,
-        VALID_SOURCES['FIIS_SOURCE']: get_data_from_fiis,
-        VALID_SOURCES['FUNDAMENTUS_SOURCE']: get_data_from_fundamentus,
-        VALID_SOURCES['FUNDSEXPLORER_SOURCE']: get_data_from_fundsexplorer,
-        VALID_SOURCES['INVESTIDOR10_SOURCE']: get_data_from_investidor10
+def get_expected_source_cost(source, info_names):
+    statistics = source_statistics.get(source)
+    if not statistics:
+        return 0
+
+    non_null_rates = statistics['non_null_rates']
+    expected_filled_infos = statistics['success_rate'] * sum(non_null_rates.get(info, 1) for info in info_names)
+
+    return statistics['latency'] / max(expected_filled_infos, 0.001)
+
+def pick_next_source(sources, missing_infos):
+    next_source = None
+    next_source_cost = None
+
+    ordered_info_sources = {
+        info: next((source_name for source_name, _ in sources if info in SOURCE_SUPPORTED_INFOS[source_name]), None)
+        for info in missing_infos if info in SOURCE_ORDERED_INFOS
     }
 
-    fetch_function = SOURCES.get(source, get_data_from_all_sources)
-    return fetch_function(ticker, info_names)
+    for index, (source_name, fetch_function) in enumerate(sources):
+        source_info_names = [
+            info for info in missing_infos
+            if info in SOURCE_SUPPORTED_INFOS[source_name] and ordered_info_sources.get(info, source_name) == source_name
+        ]
+        if not source_info_names:
+            continue
+
+        source_cost = get_expected_source_cost(source_name, source_info_names)
+
+        if next_source_cost is None or source_cost < next_source_cost:
+            next_source = (index, source_name, fetch_function, source_info_names)
+            next_source_cost = source_cost
+
+    return next_source
+
+def iterate_data_from_source_chain(ticker, info_names):
+    remaining_sources = list(SOURCE_CHAIN)
+    combined_data = {}
+    missing_infos = list(info_names)
+
+    while missing_infos:
+        next_source = pick_next_source(remaining_sources, missing_infos)
+        if not next_source:
+            break
+
+        index, source_name, fetch_function, source_info_names = next_source
+        del remaining_sources[index]
+
+        start_time = time.perf_counter()
+        source_data = fetch_function(ticker, source_info_names)
+        record_source_statistics(source_name, source_info_names, source_data, time.perf_counter() - start_time)
+
+        log_info(f'Data from {source_name}: {source_data}')
+
+        yield source_name, source_data
+
+        if source_data:
+            merge_source_data(combined_data, source_data)
+
+        missing_infos = [ info for info in info_names if combined_data.get(info) is None ]
+        log_debug(f'Missing info after {source_name}: {missing_infos}')
+
+SOURCE_FUNCTIONS = {
+    VALID_SOURCES['BMFBOVESPA_SOURCE']: get_data_from_bmfbovespa,
+    VALID_SOURCES['FIIS_SOURCE']: get_data_from_fiis,
+    VALID_SOURCES['FUNDAMENTUS_SOURCE']: get_data_from_fundamentus,
+    VALID_SOURCES['FUNDSEXPLORER_SOURCE']: get_data_from_fundsexplorer,
+    VALID_SOURCES['INVESTIDOR10_SOURCE']: get_data_from_investidor10
+}
+
+def iterate_data_from_sources(ticker, source, info_names):
+    if source not in SOURCE_FUNCTIONS:
+        yield from iterate_data_from_all_sources(ticker, info_names)
+        return
+
+    yield source, SOURCE_FUNCTIONS[source](ticker, info_names)
+
+def remember_known_ticker(ticker):
+    known_tickers.add(ticker)
+    negative_cache.pop(ticker, None)
+
+def remember_unknown_ticker(ticker, failures):
+    if ticker in known_tickers or not failures or not all(failures):
+        log_debug(f'Not caching negative result for "{ticker}" (Not found failures: {failures})')
+        return
+
+    if len(negative_cache) >= NEGATIVE_CACHE_MAX_SIZE:
+        prune_negative_cache()
+
+    negative_cache[ticker] = datetime.now()
+    log_info(f'Caching negative result for "{ticker}"')
+
+def prune_negative_cache():
+    now = datetime.now()
+
+    for ticker in [ ticker for ticker, negative_date in negative_cache.items() if now - negative_date > NEGATIVE_CACHE_EXPIRY ]:
+        del negative_cache[ticker]
+
+    while len(negative_cache) >= NEGATIVE_CACHE_MAX_SIZE:
+        del negative_cache[next(iter(negative_cache))]
+
+    log_debug(f'Negative cache pruned to {len(negative_cache)} entries')
+
+def is_known_invalid_ticker(ticker):
+    if not TICKER_PATTERN.fullmatch(ticker):
+        log_info(f'Rejecting malformed ticker "{ticker}"')
+        return True
+
+    negative_date = negative_cache.get(ticker)
+    if negative_date:
+        if datetime.now() - negative_date <= NEGATIVE_CACHE_EXPIRY:
+            log_info(f'Rejecting "{ticker}" from negative cache (Date: {negative_date.strftime(DATE_FORMAT)})')
+            return True
+
+        del negative_cache[ticker]
+
+    return False
 
 def get_data_from_cache(ticker, info_names, can_use_cache):
     if not can_use_cache:
         return None
 
-    cached_data = read_cache(ticker)
-    if not cached_data:
+    cached_fragments = read_cache_fragments(ticker)
+    if not cached_fragments:
         return None
 
-    filtered_data = { key: cached_data[key] for key in info_names if key in cached_data }
-    log_info(f'Data from Cache: {filtered_data}')
+    remember_known_ticker(ticker)
 
-    return filtered_data
+    filtered_fragments = { info: cached_fragments[info] for info in info_names if info in cached_fragments }
+    log_info(f'Data from Cache: {filtered_fragments}')
 
-def get_data(ticker, source, info_names, can_use_cache):
-    cached_data = get_data_from_cache(ticker, info_names, can_use_cache)
+    return filtered_fragments
 
-    SHOULD_UPDATE_CACHE = True
+def is_complete_cache_hit(cached_fragments, info_names):
+    return bool(cached_fragments) and all(info in cached_fragments and not is_null_json_fragment(cached_fragments[info]) for info in info_names)
 
-    if not can_use_cache:
-        return not SHOULD_UPDATE_CACHE, get_data_from_sources(ticker, source, info_names)
+def iterate_data(ticker, source, info_names, cached_fragments):
+    cached_data = decode_json_fragments(cached_fragments) if cached_fragments else None
+
+    if cached_data:
+        yield CACHE_SOURCE, cached_data
 
-    missing_cache_info_names = filter_remaining_infos(cached_data, info_names)
+    missing_cache_info_names = [ info for info in info_names if not cached_data or cached_data.get(info) is None ]
 
     if not missing_cache_info_names:
-        return not SHOULD_UPDATE_CACHE, cached_data
+        return
+
+    if not cached_data and is_known_invalid_ticker(ticker):
+        return
+
+    has_data = bool(cached_data)
+    failures = []
+    source_failures.set(failures)
+    timings = profile_timings.get()
+    start_time = time.perf_counter()
+
+    for source_name, data in iterate_data_from_sources(ticker, source, missing_cache_info_names):
+        if timings is not None:
+            timings.append((source_name, time.perf_counter() - start_time))
 
-    source_data = get_data_from_sources(ticker, source, missing_cache_info_names)
+        has_data = has_data or data is not None
+        yield source_name, data
+        start_time = time.perf_counter()
 
-    if cached_data and source_data:
-        return SHOULD_UPDATE_CACHE, { **cached_data, **source_data }
-    elif cached_data and not source_data:
-        return not SHOULD_UPDATE_CACHE, cached_data
-    elif not cached_data and source_data:
-        return SHOULD_UPDATE_CACHE, source_data
+    if has_data:
+        remember_known_ticker(ticker)
+    elif source not in SOURCE_FUNCTIONS:
+        remember_unknown_ticker(ticker, failures)
 
-    return not SHOULD_UPDATE_CACHE, None
+def get_data(ticker, source, info_names, cached_fragments):
+    return combine_source_data(iterate_data(ticker, source, info_names, cached_fragments), info_names)
+
+def resolve_data_as_json(ticker, source, info_names, can_use_cache):
+    cached_fragments = get_data_from_cache(ticker, info_names, can_use_cache)
+
+    if is_complete_cache_hit(cached_fragments, info_names):
+        log_debug(f'Serving pre-encoded cache data for "{ticker}"')
+        return join_json_fragments(cached_fragments, info_names)
+
+    should_update_cache, data = get_data(ticker, source, info_names, cached_fragments)
+
+    log_debug(f'Final Data: {data}')
+
+    if not data:
+        return None
+
+    if can_use_cache and should_update_cache:
+        upsert_cache(ticker, data)
+
+    return encode_json(data)
+
+def json_response(body, status=200):
+    return Response(body, status=status, mimetype='application/json')
+
+def encode_ndjson_line(data):
+    return f'{encode_json(data)}\n'
+
+def stream_data(ticker, source, info_names, can_use_cache, should_stream_partial_data=True):
+    source_events = []
+    cached_fragments = get_data_from_cache(ticker, info_names, can_use_cache)
+
+    for source_name, source_data in iterate_data(ticker, source, info_names, cached_fragments):
+        source_events.append((source_name, source_data))
+
+        if source_data and should_stream_partial_data:
+            yield encode_ndjson_line({ 'ticker': ticker, 'source': source_name, 'data': source_data })
+
+    should_update_cache, data = combine_source_data(source_events, info_names)
+
+    if not data:
+        yield encode_ndjson_line({ 'ticker': ticker, 'source': FINAL_SOURCE, 'error': 'No data found' })
+        return
+
+    if can_use_cache and should_update_cache:
+        upsert_cache(ticker, data)
+
+    yield encode_ndjson_line({ 'ticker': ticker, 'source': FINAL_SOURCE, 'data': data })
 
 def get_parameter_info(params, name, default=None):
     return params.get(name, default).replace(' ', '').lower()
@@ -1000,6 +2054,107 @@ def get_parameter_info(params, name, default=None):
 def get_cache_parameter_info(params, name, default='0'):
     return get_parameter_info(params, name, default) in { '1', 's', 'sim', 't', 'true', 'y', 'yes' }
 
+def get_source_parameter_info(params):
+    raw_source = get_parameter_info(params, 'source', VALID_SOURCES['ALL_SOURCE'])
+    return raw_source if raw_source in VALID_SOURCES.values() else VALID_SOURCES['ALL_SOURCE']
+
+def get_info_names_parameter_info(params):
+    raw_info_names = [ info for info in get_parameter_info(params, 'info_names', '').split(',') if info in VALID_INFOS ]
+    return raw_info_names if len(raw_info_names) else VALID_INFOS
+
+def should_stream_response():
+    return get_cache_parameter_info(request.args, 'stream') or NDJSON_MIMETYPE in request.headers.get('Accept', '')
+
+def should_profile_request():
+    return PROFILING_ENABLED and (get_cache_parameter_info(request.args, 'profile') or get_cache_parameter_info(request.headers, 'X-Profile'))
+
+def write_profile(name, profiler, source_timings, total_time):
+    stats = pstats.Stats(profiler).stats
+    functions = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:PROFILE_MAX_FUNCTIONS]
+
+    profile = {
+        'name': name,
+        'date': datetime.now().strftime(DATE_FORMAT),
+        'total_time': total_time,
+        'sources': [ { 'source': source_name, 'time': elapsed_time } for source_name, elapsed_time in source_timings ],
+        'functions': [
+            { 'function': f'{file}:{line}({function})', 'calls': calls, 'total_time': total, 'cumulative_time': cumulative }
+            for (file, line, function), (_, calls, total, cumulative, _) in functions
+        ]
+    }
+
+    path = os.path.join(PROFILE_DIRECTORY, f'profile_{name}_{datetime.now().strftime("%Y%m%d%H%M%S%f")}.json')
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(profile, file, indent=2)
+
+    return path
+
+def profile_call(name, function, *args):
+    if not profile_lock.acquire(blocking=False):
+        log_info(f'Not profiling "{name}" while another request is being profiled')
+        return function(*args), {}
+
+    profiler = cProfile.Profile()
+    source_timings = []
+    token = profile_timings.set(source_timings)
+    start_time = time.perf_counter()
+
+    try:
+        result = profiler.runcall(function, *args)
+    finally:
+        profile_timings.reset(token)
+        profile_lock.release()
+
+    total_time = time.perf_counter() - start_time
+
+    try:
+        path = write_profile(name, profiler, source_timings, total_time)
+    except:
+        log_error(f'Error writing profile for "{name}": {traceback.format_exc()}')
+        path = None
+
+    log_info(f'Profiled "{name}" in {total_time:.3f}s (Sources: {source_timings} - File: {path})')
+
+    headers = { 'Server-Timing': ', '.join(f'{source_name};dur={elapsed_time * 1000:.1f}' for source_name, elapsed_time in source_timings + [ ('total', total_time) ]) }
+    if path:
+        headers['X-Profile-File'] = path
+
+    return result, headers
+
+def compress_body(body, accept_encodings):
+    brotli_quality = accept_encodings['br'] if brotli else 0
+    gzip_quality = accept_encodings['gzip']
+
+    if brotli_quality and brotli_quality >= gzip_quality:
+        return 'br', brotli.compress(body, quality=COMPRESSION_LEVEL)
+
+    if gzip_quality:
+        return 'gzip', gzip.compress(body, compresslevel=COMPRESSION_LEVEL)
+
+    return None, body
+
+@app.after_request
+def compress_response(response):
+    if response.is_streamed or response.direct_passthrough or 'Content-Encoding' in response.headers or response.mimetype == 'application/gzip':
+        return response
+
+    response.vary.add('Accept-Encoding')
+
+    body = response.get_data()
+    if len(body) < COMPRESSION_MIN_SIZE:
+        return response
+
+    encoding, compressed_body = compress_body(body, request.accept_encodings)
+    if not encoding:
+        return response
+
+    response.set_data(compressed_body)
+    response.headers['Content-Encoding'] = encoding
+
+    log_info(f'Response compressed with {encoding}: {len(body)} bytes to {len(compressed_body)} bytes ({len(body) - len(compressed_body)} bytes saved)')
+
+    return response
+
 @app.route('/fii/<ticker>', methods=['GET'])
 def get_fii_data(ticker):
     should_delete_all_cache = get_cache_parameter_info(request.args, 'should_delete_all_cache')
@@ -1008,28 +2163,116 @@ def get_fii_data(ticker):
 
     ticker = ticker.upper()
 
-    raw_source = get_parameter_info(request.args, 'source', VALID_SOURCES['ALL_SOURCE'])
-    source = raw_source if raw_source in VALID_SOURCES.values() else VALID_SOURCES['ALL_SOURCE']
-
-    raw_info_names = [ info for info in get_parameter_info(request.args, 'info_names', '').split(',') if info in VALID_INFOS ]
-    info_names = raw_info_names if len(raw_info_names) else VALID_INFOS
+    source = get_source_parameter_info(request.args)
+    info_names = get_info_names_parameter_info(request.args)
 
     log_debug(f'Should Delete cache? {should_delete_all_cache} - Should Clear cache? {should_clear_cached_data} - Should Use cache? {should_use_cache}')
     log_debug(f'Ticker: {ticker} - Source: {source} - Info names: {info_names}')
 
     can_use_cache = preprocess_cache(ticker, should_delete_all_cache, should_clear_cached_data, should_use_cache)
 
-    should_update_cache, data = get_data(ticker, source, info_names, can_use_cache)
+    if should_stream_response():
+        return Response(stream_with_context(stream_data(ticker, source, info_names, can_use_cache)), mimetype=NDJSON_MIMETYPE)
 
-    log_debug(f'Final Data: {data}')
+    if should_profile_request():
+        body, profile_headers = profile_call(ticker, resolve_data_as_json, ticker, source, info_names, can_use_cache)
+    else:
+        body, profile_headers = resolve_data_as_json(ticker, source, info_names, can_use_cache), {}
 
-    if not data:
-        return jsonify({ 'error': 'No data found' }), 404
+    if not body:
+        return jsonify({ 'error': 'No data found' }), 404, profile_headers
 
-    if can_use_cache and should_update_cache:
-        upsert_cache(ticker, data)
+    response = json_response(body)
+    response.headers.update(profile_headers)
+
+    return response
+
+@app.route('/fii', methods=['GET'])
+def get_fiis_data():
+    should_delete_all_cache = get_cache_parameter_info(request.args, 'should_delete_all_cache')
+    should_clear_cached_data = get_cache_parameter_info(request.args, 'should_clear_cached_data')
+    should_use_cache = get_cache_parameter_info(request.args, 'should_use_cache', '1')
+
+    tickers = list(dict.fromkeys(ticker for ticker in get_parameter_info(request.args, 'tickers', '').upper().split(',') if ticker))
+
+    source = get_source_parameter_info(request.args)
+    info_names = get_info_names_parameter_info(request.args)
+
+    log_debug(f'Tickers: {tickers} - Source: {source} - Info names: {info_names}')
+
+    if not tickers:
+        return jsonify({ 'error': 'No tickers informed' }), 400
+
+    if should_delete_all_cache:
+        delete_cache()
+
+    can_use_cache_by_ticker = { ticker: preprocess_cache(ticker, False, should_delete_all_cache or should_clear_cached_data, should_use_cache) for ticker in tickers }
+
+    def stream_fiis_data():
+        for ticker in tickers:
+            yield from stream_data(ticker, source, info_names, can_use_cache_by_ticker[ticker], should_stream_partial_data=False)
+
+    if should_stream_response():
+        return Response(stream_with_context(stream_fiis_data()), mimetype=NDJSON_MIMETYPE)
+
+    all_bodies = [ f'{encode_json(ticker)}:{resolve_data_as_json(ticker, source, info_names, can_use_cache_by_ticker[ticker]) or "null"}' for ticker in tickers ]
+
+    return json_response('{' + ','.join(all_bodies) + '}')
+
+@app.route('/fii/<ticker>/history', methods=['GET'])
+def get_fii_history(ticker):
+    if not HISTORY_ENABLED:
+        return jsonify({ 'error': 'History is disabled' }), 404
+
+    info_names = get_info_names_parameter_info(request.args)
+
+    try:
+        from_date = datetime.strptime(get_parameter_info(request.args, 'from', '01-01-1970'), '%d-%m-%Y')
+        to_date = datetime.strptime(get_parameter_info(request.args, 'to', datetime.now().strftime('%d-%m-%Y')), '%d-%m-%Y') + timedelta(days=1)
+    except ValueError:
+        return jsonify({ 'error': 'Invalid date, expected dd-mm-YYYY' }), 400
+
+    return jsonify(read_history(ticker.upper(), info_names, from_date, to_date)), 200
+
+@app.route('/changes', methods=['GET'])
+def get_changes():
+    since_as_text = get_parameter_info(request.args, 'since', '0')
+
+    if not since_as_text.isdigit():
+        return jsonify({ 'error': 'Invalid since version' }), 400
+
+    version, changes = read_changes(int(since_as_text))
+
+    return jsonify({ 'version': version, 'changes': changes }), 200
+
+@app.route('/sources/statistics', methods=['GET'])
+def get_source_statistics():
+    return jsonify(source_statistics), 200
+
+@app.route('/cache/snapshot', methods=['GET'])
+def get_cache_snapshot():
+    return Response(
+        export_cache_snapshot(),
+        mimetype='application/gzip',
+        headers={ 'Content-Disposition': 'attachment; filename=cache-snapshot.gz' }
+    )
+
+@app.route('/cvm/informe_mensal', methods=['POST'])
+def ingest_cvm_informe_mensal_data():
+    year = get_parameter_info(request.args, 'year', str(datetime.now().year))
+
+    if not CVM_YEAR_PATTERN.fullmatch(year):
+        return jsonify({ 'error': 'Invalid year' }), 400
+
+    try:
+        total_funds = ingest_cvm_informe_mensal(CVM_INFORME_MENSAL_SOURCE.format(year=year))
+    except:
+        log_error(f'Error ingesting CVM Informe Mensal for {year}: {traceback.format_exc()}')
+        return jsonify({ 'error': 'CVM Informe Mensal ingestion failed' }), 502
+
+    return jsonify({ 'total_funds': total_funds }), 200
 
-    return jsonify(data), 200
+load_cache_snapshot()
 
 if __name__ == '__main__':
     log_debug('Starting fiiCrawler API')
@@ -0,0 +1,55 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import index
+
+@pytest.fixture(autouse=True)
+def isolated_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(index, 'CACHE_FILE', str(tmp_path / 'cache.txt'))
+    monkeypatch.setattr(index, 'CACHE_LOCK_FILE', str(tmp_path / 'cache.txt.lock'))
+    monkeypatch.setattr(index, 'CHANGES_FILE', str(tmp_path / 'changes.txt'))
+    monkeypatch.setattr(index, 'HISTORY_FILE', str(tmp_path / 'history.bin'))
+    monkeypatch.setattr(index, 'history_index', (0, {}, {}))
+    monkeypatch.setattr(index, 'negative_cache', {})
+    monkeypatch.setattr(index, 'known_tickers', set())
+    monkeypatch.setattr(index, 'fundamentus_listing_data', (None, None))
+
+    return tmp_path
+
+@pytest.fixture
+def stub_sources(monkeypatch):
+    calls = []
+
+    def make_fetch(source_name, data_by_ticker):
+        def fetch(ticker, info_names):
+            calls.append((source_name, ticker))
+
+            data = data_by_ticker.get(ticker)
+
+            if isinstance(data, Exception):
+                try:
+                    raise data
+                except:
+                    index.record_source_failure()
+                    return None
+
+            return { info: data.get(info) for info in info_names } if data else None
+
+        return fetch
+
+    def install(data_by_source):
+        fetch_functions = { source_name: make_fetch(source_name, data_by_source.get(source_name, {})) for source_name in index.SOURCE_FUNCTIONS }
+
+        monkeypatch.setattr(index, 'SOURCE_CHAIN', [ (source_name, fetch_functions[source_name]) for source_name, _ in index.SOURCE_CHAIN ])
+        monkeypatch.setattr(index, 'SOURCE_FUNCTIONS', fetch_functions)
+
+        return calls
+
+    monkeypatch.setattr(index, 'source_statistics', {})
+    monkeypatch.setattr(index, 'get_data_from_fundamentus_listing', lambda ticker, info_names: None)
+
+    return install
@@ -0,0 +1,14 @@
+import index
+
+def test_upsert_new_fund_record_is_cached_and_logged():
+    index.upsert_cache_entries({ 'HGLG11': index.FundRecord({ 'name': 'CSHG Logística', 'pvp': 1.02 }) })
+
+    assert index.read_cache('HGLG11') == { 'name': 'CSHG Logística', 'pvp': 1.02 }
+    assert index.read_changes(0) == (1, { 'HGLG11': { 'name': 'CSHG Logística', 'pvp': 1.02 } })
+
+def test_upsert_existing_fund_record_logs_only_changed_fields():
+    index.upsert_cache_entries({ 'HGLG11': index.FundRecord({ 'name': 'CSHG Logística', 'pvp': 1.02 }) })
+    index.upsert_cache_entries({ 'HGLG11': index.FundRecord({ 'name': 'CSHG Logística', 'pvp': 0.98 }) })
+
+    assert index.read_cache('HGLG11') == { 'name': 'CSHG Logística', 'pvp': 0.98 }
+    assert index.read_changes(1) == (2, { 'HGLG11': { 'pvp': 0.98 } })
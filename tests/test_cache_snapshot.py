@@ -0,0 +1,26 @@
+import requests
+
+import index
+
+def test_snapshot_round_trip():
+    index.upsert_cache_entries({ 'HGLG11': { 'name': 'CSHG Logística', 'pvp': 1.02 } })
+    snapshot = index.export_cache_snapshot()
+    index.delete_cache()
+
+    assert index.import_cache_snapshot(snapshot) == 1
+    assert index.read_cache('HGLG11') == { 'name': 'CSHG Logística', 'pvp': 1.02 }
+
+def test_snapshot_download_uses_timeout(monkeypatch):
+    requested_timeouts = []
+
+    def get(url, headers=None, timeout=None):
+        requested_timeouts.append(timeout)
+        raise requests.Timeout('Snapshot download timed out')
+
+    monkeypatch.setattr(index, 'CACHE_SNAPSHOT_URL', 'https://example.com/cache-snapshot.gz')
+    monkeypatch.setattr(index.requests, 'get', get)
+
+    index.load_cache_snapshot()
+
+    assert requested_timeouts == [ index.CACHE_SNAPSHOT_TIMEOUT ]
+    assert not index.cache_exists()
@@ -0,0 +1,43 @@
+import index
+
+def append_price_changes(total_changes):
+    index.append_changes([ (f'FII{version % 7:03d}11', { 'price': float(version) }) for version in range(1, total_changes + 1) ])
+
+def test_read_changes_since_version_merges_later_changes_only():
+    append_price_changes(500)
+
+    version, changes = index.read_changes(495)
+
+    assert version == 500
+    assert changes == {
+        'FII00611': { 'price': 496.0 },
+        'FII00011': { 'price': 497.0 },
+        'FII00111': { 'price': 498.0 },
+        'FII00211': { 'price': 499.0 },
+        'FII00311': { 'price': 500.0 }
+    }
+    assert index.read_changes(500) == (500, {})
+    assert index.read_changes(0)[0] == 500
+
+def test_read_changes_seeks_instead_of_scanning(monkeypatch):
+    append_price_changes(2000)
+    decoded_versions = []
+    decode_json = index.decode_json
+    monkeypatch.setattr(index, 'decode_json', lambda text: decoded_versions.append(text) or decode_json(text))
+
+    version, _ = index.read_changes(1990)
+
+    assert version == 2000
+    assert len(decoded_versions) == 10
+
+def test_torn_last_line_does_not_break_later_writes():
+    append_price_changes(3)
+    with open(index.CHANGES_FILE, 'a', encoding='utf-8') as changes_file:
+        changes_file.write('4#@#HGLG11#@#{"pri')
+
+    assert index.read_latest_change_version() == 3
+
+    index.append_changes([ ('HGLG11', { 'price': 160.5 }) ])
+
+    assert index.read_latest_change_version() == 4
+    assert index.read_changes(3) == (4, { 'HGLG11': { 'price': 160.5 } })
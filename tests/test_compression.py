@@ -0,0 +1,24 @@
+import pytest
+
+import index
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(index, 'COMPRESSION_MIN_SIZE', 0)
+    return index.app.test_client()
+
+@pytest.mark.parametrize('accept_encoding, expected_encoding', [
+    ('gzip', 'gzip'),
+    ('GZIP', 'gzip'),
+    ('gzip;q=0', None),
+    ('identity', None),
+    ('', None),
+    ('br;q=0, gzip;q=0.5', 'gzip'),
+    ('gzip, br;q=0.5', 'gzip'),
+    ('gzip;q=0.5, br', 'br' if index.brotli else 'gzip'),
+    ('br', 'br' if index.brotli else None)
+])
+def test_response_encoding_honours_accept_encoding_qualities(client, accept_encoding, expected_encoding):
+    response = client.get('/sources/statistics', headers={ 'Accept-Encoding': accept_encoding })
+
+    assert response.headers.get('Content-Encoding') == expected_encoding
@@ -0,0 +1,82 @@
+import os
+import zipfile
+
+import pytest
+
+import index
+
+FIXTURES_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'cvm')
+
+HGLG11_CNPJ = '11728688000147'
+MXRF11_CNPJ = '97521225000125'
+
+@pytest.fixture
+def informe_mensal_zip(tmp_path):
+    path = tmp_path / 'inf_mensal_fii_2024.zip'
+
+    with zipfile.ZipFile(path, 'w') as zip_file:
+        for file_name in os.listdir(FIXTURES_DIRECTORY):
+            zip_file.write(os.path.join(FIXTURES_DIRECTORY, file_name), file_name)
+
+    return str(path)
+
+def test_convert_csv_keeps_latest_reference_date():
+    reports = index.convert_cvm_informe_mensal_data(os.path.join(FIXTURES_DIRECTORY, 'inf_mensal_fii_geral_2024.csv'))
+
+    assert reports[HGLG11_CNPJ]['name'] == 'CSHG LOGÍSTICA FII'
+    assert reports[HGLG11_CNPJ]['initial_date'] == '08/03/2010'
+    assert reports[MXRF11_CNPJ]['segment'] == 'Títulos e Val. Mob.'
+
+def test_convert_zip_merges_reports_and_aggregates_types(informe_mensal_zip):
+    reports = index.convert_cvm_informe_mensal_data(informe_mensal_zip)
+
+    hglg11 = reports[HGLG11_CNPJ]
+    assert hglg11['equity_price'] == 165.95
+    assert hglg11['total_issued_shares'] == 23500000
+    assert hglg11['total_real_state_value'] == 3500000000
+    assert hglg11['total_mortgage_value'] == 200000000
+    assert hglg11['total_stocks_fund_others_value'] == 100000000
+    assert hglg11['type'] == 'Tijolo'
+
+    mxrf11 = reports[MXRF11_CNPJ]
+    assert mxrf11['total_mortgage_value'] == 2550000000
+    assert mxrf11['debit_by_real_state_acquisition'] is None
+    assert mxrf11['type'] == 'Papel'
+
+def test_convert_directory_matches_zip(informe_mensal_zip):
+    assert index.convert_cvm_informe_mensal_data(FIXTURES_DIRECTORY) == index.convert_cvm_informe_mensal_data(informe_mensal_zip)
+
+def test_ingest_route_caches_funds_on_cold_cache(monkeypatch, informe_mensal_zip):
+    monkeypatch.setattr(index, 'HISTORY_ENABLED', True)
+    monkeypatch.setattr(index, 'CVM_INFORME_MENSAL_SOURCE', os.path.join(os.path.dirname(informe_mensal_zip), 'inf_mensal_fii_{year}.zip'))
+
+    response = index.app.test_client().post('/cvm/informe_mensal?year=2024')
+
+    assert response.status_code == 200
+    assert response.json == { 'total_funds': 2 }
+    assert index.get_data_from_cvm_cache('11.728.688/0001-47', [ 'type', 'equity_price' ]) == { 'type': 'Tijolo', 'equity_price': 165.95 }
+    assert index.read_changes(0) == (0, {})
+    assert not os.path.exists(index.HISTORY_FILE)
+
+@pytest.mark.parametrize('year', [ '../../etc/passwd', '24', '2024/x', '20245' ])
+def test_ingest_route_rejects_invalid_year(monkeypatch, year):
+    monkeypatch.setattr(index, 'convert_cvm_informe_mensal_data', lambda source: pytest.fail(f'Unexpected ingestion of {source}'))
+
+    response = index.app.test_client().post('/cvm/informe_mensal', query_string={ 'year': year })
+
+    assert response.status_code == 400
+
+@pytest.mark.parametrize('file_name, content', [ ('inf_mensal_fii_{year}.zip', None), ('inf_mensal_fii_{year}.txt', b'not a report'), ('inf_mensal_fii_{year}', 'directory') ])
+def test_ingest_route_fails_without_report_files(monkeypatch, tmp_path, file_name, content):
+    source = tmp_path / file_name.format(year=2024)
+    if content == 'directory':
+        source.mkdir()
+        (source / 'README.txt').write_text('No reports here')
+    elif content:
+        source.write_bytes(content)
+
+    monkeypatch.setattr(index, 'CVM_INFORME_MENSAL_SOURCE', str(tmp_path / file_name))
+
+    response = index.app.test_client().post('/cvm/informe_mensal?year=2024')
+
+    assert response.status_code == 502
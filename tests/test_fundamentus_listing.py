@@ -0,0 +1,30 @@
+from datetime import datetime
+
+import index
+
+def test_listing_cache_entry_does_not_hide_missing_fields(stub_sources):
+    index.upsert_cache_entries({ 'HGLG11': index.FundRecord({ 'price': 160.5, 'pvp': 1.02 }) })
+    calls = stub_sources({ 'fundamentus': { 'HGLG11': { 'name': 'CSHG Logística', 'price': 159.0 } } })
+
+    response = index.app.test_client().get('/fii/hglg11?info_names=name,price,pvp')
+
+    assert response.status_code == 200
+    assert response.json == { 'name': 'CSHG Logística', 'price': 160.5, 'pvp': 1.02 }
+    assert ('fundamentus', 'HGLG11') in calls
+
+LISTING_WITHOUT_DIVIDEND_YIELD = '''
+<table id="tabelaResultado">
+  <thead><tr><th>Papel</th><th>Cota&ccedil;&atilde;o</th><th>P/VP</th></tr></thead>
+  <tbody>
+    <tr><td><a href="detalhes.php?papel=HGLG11">HGLG11</a></td><td>160,50</td><td>1,02</td></tr>
+    <tr><td><a href="detalhes.php?papel=MXRF11">MXRF11</a></td><td>9,87</td><td>0,99</td></tr>
+  </tbody>
+</table>
+'''
+
+def test_listing_missing_a_column_returns_none_for_it():
+    listing = index.convert_fundamentus_listing_data(LISTING_WITHOUT_DIVIDEND_YIELD)
+    index.fundamentus_listing_data = (datetime.now(), listing)
+
+    assert listing['MXRF11'] == { 'price': 9.87, 'pvp': 0.99 }
+    assert index.get_data_from_fundamentus_listing('HGLG11', [ 'price', 'dy', 'pvp' ]) == { 'price': 160.5, 'dy': None, 'pvp': 1.02 }
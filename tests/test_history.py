@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import index
+
+START_DATE = datetime(2024, 1, 1)
+
+@pytest.fixture
+def daily_history(monkeypatch):
+    monkeypatch.setattr(index, 'HISTORY_ENABLED', True)
+    now = [ START_DATE.timestamp() ]
+    monkeypatch.setattr(index.time, 'time', lambda: now[0])
+
+    for day in range(400):
+        now[0] = (START_DATE + timedelta(days=day)).timestamp()
+        index.upsert_cache_entries({
+            'HGLG11': { 'pvp': 1.0 + day // 100 / 10, 'vacancy': 0.05, 'name': 'CSHG Logística' },
+            **{ f'FII{number:03d}11': { 'pvp': float(day) } for number in range(20) }
+        })
+
+def test_unchanged_values_are_written_only_as_keyframes(daily_history):
+    _, _, record_numbers = index.read_history_index()
+
+    assert len(record_numbers[b'HGLG11'.ljust(16, b'\0')]) == 16 + 14
+
+def test_range_query_returns_changes_starting_at_value_in_effect(daily_history):
+    history = index.read_history('HGLG11', [ 'pvp', 'vacancy', 'name' ], datetime(2024, 3, 15), datetime(2024, 8, 21))
+
+    assert history == {
+        'pvp': [ [ '01-03-2024 00:00:00', 1.0 ], [ '10-04-2024 00:00:00', 1.1 ], [ '19-07-2024 00:00:00', 1.2 ] ],
+        'vacancy': [ [ '01-03-2024 00:00:00', 0.05 ] ]
+    }
+
+def test_history_route_validates_dates(daily_history):
+    client = index.app.test_client()
+
+    assert client.get('/fii/hglg11/history?info_names=pvp&from=2024-01-01').status_code == 400
+    assert client.get('/fii/hglg11/history?info_names=pvp&from=01-10-2024').json == {
+        'pvp': [ [ '17-09-2024 00:00:00', 1.2 ], [ '27-10-2024 00:00:00', 1.3 ] ]
+    }
+
+def test_torn_tail_is_truncated_before_appending(daily_history):
+    with open(index.HISTORY_FILE, 'ab') as history_file:
+        history_file.write(b'\1\2\3')
+
+    index.upsert_cache_entries({ 'HGLG11': { 'pvp': 2.0 } })
+
+    assert index.read_history('HGLG11', [ 'pvp' ], datetime(2025, 2, 1), datetime(2030, 1, 1))['pvp'][-1][1] == 2.0
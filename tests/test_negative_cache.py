@@ -0,0 +1,102 @@
+from datetime import datetime
+
+import requests
+
+import index
+
+def http_error(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.HTTPError(response=response)
+
+NOT_FOUND_BY_SOURCE = {
+    'bmfbovespa': { 'NOPE11': index.TickerNotFoundError('No CNPJ') },
+    'fundamentus': { 'NOPE11': index.TickerNotFoundError('Nenhum papel encontrado') },
+    'fiis': { 'NOPE11': http_error(404) },
+    'investidor10': { 'NOPE11': http_error(404) }
+}
+
+def test_confirmed_miss_is_negatively_cached(stub_sources):
+    calls = stub_sources(NOT_FOUND_BY_SOURCE)
+    client = index.app.test_client()
+
+    assert client.get('/fii/nope11?info_names=name').status_code == 404
+    total_calls = len(calls)
+
+    assert client.get('/fii/nope11?info_names=name').status_code == 404
+    assert len(calls) == total_calls
+    assert 'NOPE11' in index.negative_cache
+
+def test_network_errors_are_not_negatively_cached(stub_sources):
+    calls = stub_sources({
+        **NOT_FOUND_BY_SOURCE,
+        'fiis': { 'NOPE11': requests.ConnectionError('Network is unreachable') },
+        'investidor10': { 'NOPE11': http_error(503) }
+    })
+    client = index.app.test_client()
+
+    assert client.get('/fii/nope11?info_names=name').status_code == 404
+    total_calls = len(calls)
+
+    assert client.get('/fii/nope11?info_names=name').status_code == 404
+    assert len(calls) > total_calls
+    assert 'NOPE11' not in index.negative_cache
+
+def test_malformed_ticker_is_rejected_without_source_calls(stub_sources):
+    calls = stub_sources({})
+
+    assert index.app.test_client().get('/fii/not-a-ticker').status_code == 404
+    assert calls == []
+
+def test_ticker_missing_from_listing_is_still_looked_up(stub_sources):
+    index.fundamentus_listing_data = (datetime.now(), { 'HGLG11': index.FundRecord({ 'price': 160.5 }) })
+    index.known_tickers.add('HGLG11')
+    stub_sources({ 'fiis': { 'NEWF11': { 'name': 'Novo Fundo' } } })
+
+    response = index.app.test_client().get('/fii/newf11?info_names=name&source=fiis')
+
+    assert response.status_code == 200
+    assert response.json == { 'name': 'Novo Fundo' }
+
+    response = index.app.test_client().get('/fii/newf11?info_names=name')
+
+    assert response.status_code == 200
+    assert 'NEWF11' in index.known_tickers
+
+def test_found_page_without_requested_values_is_not_negatively_cached(stub_sources):
+    stub_sources({
+        **NOT_FOUND_BY_SOURCE,
+        'bmfbovespa': {},
+        'fundamentus': { 'NEWF11': index.TickerNotFoundError('Nenhum papel encontrado') },
+        'fiis': { 'NEWF11': { 'name': 'Novo Fundo', 'vacancy': None } },
+        'investidor10': {}
+    })
+    client = index.app.test_client()
+
+    response = client.get('/fii/newf11?info_names=vacancy&should_use_cache=0')
+
+    assert response.status_code == 200
+    assert response.json == { 'vacancy': None }
+    assert 'NEWF11' not in index.negative_cache
+    assert 'NEWF11' in index.known_tickers
+
+    response = client.get('/fii/newf11?info_names=name&should_use_cache=0')
+
+    assert response.status_code == 200
+    assert response.json == { 'name': 'Novo Fundo' }
+
+def test_negative_cache_prunes_expired_then_oldest_entries(monkeypatch):
+    monkeypatch.setattr(index, 'NEGATIVE_CACHE_MAX_SIZE', 3)
+    index.negative_cache.update({
+        'OLDA11': datetime.now() - index.NEGATIVE_CACHE_EXPIRY * 2,
+        'NEWA11': datetime.now(),
+        'NEWB11': datetime.now()
+    })
+
+    index.remember_unknown_ticker('NEWC11', [ True ])
+
+    assert list(index.negative_cache) == [ 'NEWA11', 'NEWB11', 'NEWC11' ]
+
+    index.remember_unknown_ticker('NEWD11', [ True ])
+
+    assert list(index.negative_cache) == [ 'NEWB11', 'NEWC11', 'NEWD11' ]
@@ -0,0 +1,47 @@
+import pytest
+
+import index
+
+@pytest.mark.parametrize('text, expected', [
+    ('1', 1.0),
+    ('1.234', 1234.0),
+    ('1.234.567,89', 1234567.89),
+    ('0,95', 0.95),
+    (',5', 0.5),
+    ('12,5%', 12.5),
+    ('R$ 9,87', 9.87),
+    ('R$9,87', 9.87),
+    ('R$ -1,00', -1.0),
+    ('-R$ 1,00', -1.0),
+    ('-3,2%', -3.2),
+    ('+3,2', 3.2),
+    ('  7,10  ', 7.1),
+    ('1,5 Mil', 1500.0),
+    ('2,3 M', 2300000.0),
+    ('R$ 4,56 Milhões', 4560000.0),
+    ('1,2 Bilhões', 1200000000.0),
+    ('3 Bi', 3000000000.0),
+    (12.5, 12.5),
+    (3, 3),
+    ('-', None),
+    ('', None),
+    (None, None),
+    ('N/A', None),
+    ('abc', None),
+    ('1,2,3', None),
+    ('12 reais', None)
+])
+def test_parse_number(text, expected):
+    value = index.parse_number(text)
+
+    if expected is None:
+        assert value is None
+    else:
+        assert value == pytest.approx(expected)
+
+def test_parse_number_converts_percent_to_decimal():
+    assert index.parse_number('12,5%', convert_percent_to_decimal=True) == pytest.approx(0.125)
+    assert index.parse_number('12,5', convert_percent_to_decimal=True) == pytest.approx(12.5)
+
+def test_parse_numbers():
+    assert index.parse_numbers([ '1,5', '-', '10%' ], convert_percent_to_decimal=True) == [ 1.5, None, 0.1 ]
@@ -0,0 +1,53 @@
+import json
+import threading
+
+import index
+
+def test_profiling_is_disabled_without_env_flag(stub_sources):
+    stub_sources({ 'fiis': { 'HGLG11': { 'name': 'CSHG Logística' } } })
+
+    response = index.app.test_client().get('/fii/hglg11?info_names=name&profile=1')
+
+    assert response.status_code == 200
+    assert 'Server-Timing' not in response.headers
+    assert 'X-Profile-File' not in response.headers
+
+def test_concurrent_requests_do_not_leak_into_profile(stub_sources, monkeypatch, tmp_path):
+    monkeypatch.setattr(index, 'PROFILING_ENABLED', True)
+    monkeypatch.setattr(index, 'PROFILE_DIRECTORY', str(tmp_path))
+    calls = stub_sources({ 'fiis': { 'HGLG11': { 'name': 'CSHG Logística' }, 'XPLG11': { 'name': 'XP Log' } } })
+
+    profiled_started = threading.Event()
+    unprofiled_finished = threading.Event()
+    fiis_fetch = index.SOURCE_FUNCTIONS['fiis']
+
+    def fetch(ticker, info_names):
+        if ticker == 'HGLG11':
+            profiled_started.set()
+            unprofiled_finished.wait(5)
+
+        return fiis_fetch(ticker, info_names)
+
+    monkeypatch.setitem(index.SOURCE_FUNCTIONS, 'fiis', fetch)
+
+    def request_unprofiled():
+        profiled_started.wait(5)
+        index.app.test_client().get('/fii/xplg11?info_names=name&source=fiis')
+        unprofiled_finished.set()
+
+    thread = threading.Thread(target=request_unprofiled)
+    thread.start()
+
+    response = index.app.test_client().get('/fii/hglg11?info_names=name&source=fiis', headers={ 'X-Profile': '1' })
+    thread.join()
+
+    assert response.status_code == 200
+    assert response.headers['Server-Timing'].startswith('fiis;dur=')
+    assert response.headers['Server-Timing'].count('fiis;') == 1
+
+    with open(response.headers['X-Profile-File'], encoding='utf-8') as profile_file:
+        profile = json.load(profile_file)
+
+    assert [ timing['source'] for timing in profile['sources'] ] == [ 'fiis' ]
+    assert profile['functions']
+    assert ('fiis', 'XPLG11') in calls
@@ -0,0 +1,48 @@
+import index
+
+BMFBOVESPA_DATA = { 'HGLG11': {
+    'equity_price': 165.95,
+    'initial_date': '08/03/2010',
+    'name': 'CSHG LOGÍSTICA FII',
+    'segment': 'Logística',
+    'target_public': 'Investidores em Geral',
+    'term': 'Indeterminado',
+    'total_real_state': 21,
+    'type': 'Tijolo'
+} }
+FIIS_DATA = { 'HGLG11': {
+    'equity_price': 166.0,
+    'initial_date': '2010-03-08',
+    'name': 'CSHG Logística',
+    'price': 160.5,
+    'segment': 'Galpões',
+    'target_public': 'Geral',
+    'term': 'Indeterminado',
+    'total_real_state': 18,
+    'type': 'Lajes'
+} }
+
+def make_fiis_cheapest():
+    index.source_statistics.update({
+        'bmfbovespa': { 'latency': 5.0, 'samples': 10, 'success_rate': 1, 'non_null_rates': {} },
+        'fiis': { 'latency': 0.1, 'samples': 10, 'success_rate': 1, 'non_null_rates': {} }
+    })
+
+def test_ordered_infos_keep_source_chain_authority(stub_sources):
+    stub_sources({ 'bmfbovespa': BMFBOVESPA_DATA, 'fiis': FIIS_DATA })
+    make_fiis_cheapest()
+
+    ordered_infos = [ 'initial_date', 'name', 'segment', 'target_public', 'term', 'total_real_state', 'type' ]
+
+    _, data = index.get_data('HGLG11', index.VALID_SOURCES['ALL_SOURCE'], [ *ordered_infos, 'price' ], None)
+
+    assert data == { **{ info: BMFBOVESPA_DATA['HGLG11'][info] for info in ordered_infos }, 'price': 160.5 }
+
+def test_interchangeable_infos_follow_observed_cost(stub_sources):
+    calls = stub_sources({ 'bmfbovespa': BMFBOVESPA_DATA, 'fiis': FIIS_DATA })
+    make_fiis_cheapest()
+
+    _, data = index.get_data('HGLG11', index.VALID_SOURCES['ALL_SOURCE'], [ 'equity_price' ], None)
+
+    assert data == { 'equity_price': 166.0 }
+    assert ('bmfbovespa', 'HGLG11') not in calls